@@ -1,25 +1,17 @@
-import os
 import jwt
-from fastapi import Depends, HTTPException, Header
-from models import User
-from sqlalchemy.orm import Session
-from database import get_db
-from dotenv import load_dotenv
+from fastapi import HTTPException, Header
+from auth.tokens import decode_token
+from auth.user_cache import CachedUser, load_user
 
-load_dotenv()
 
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "super-secret-key")
-ALGORITHM = "HS256"
-
-
-def get_current_user(token: str = Header(...), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Header(...)) -> CachedUser:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         user_id: str = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await load_user(int(user_id))
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
 
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+from database import SessionLocal
+from models import User
+
+load_dotenv()
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+# How long to remember that an id has no user; 0 turns negative caching off
+USER_CACHE_NEGATIVE_TTL = float(os.getenv("USER_CACHE_NEGATIVE_TTL", "10"))
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    id: int
+    username: str | None
+    role: str
+    is_admin: bool
+
+
+class UserCache:
+    """In-process TTL cache of the user fields auth needs.
+
+    Each worker has its own copy, so an invalidation only reaches the worker
+    that made the change; the TTL bounds how stale the others can get.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[float, CachedUser | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> tuple[bool, CachedUser | None]:
+        """Return ``(found, user)``; a found ``None`` is a cached unknown id."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                expires_at, user = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return True, user
+                del self._entries[user_id]
+            self.misses += 1
+            return False, None
+
+    def put(self, user_id: int, user: CachedUser | None):
+        ttl = self.ttl if user is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL, USER_CACHE_NEGATIVE_TTL)
+
+
+def invalidate_user(user_id: int):
+    """Drop a user from the cache; call after registering or updating one."""
+    user_cache.invalidate(user_id)
+
+
+async def load_user(user_id: int) -> CachedUser | None:
+    """Look a user up, only opening a DB session on a cache miss."""
+    found, user = user_cache.get(user_id)
+    if found:
+        return user
+
+    async with SessionLocal() as db:
+        record = await db.get(User, user_id)
+    if record is not None:
+        user = CachedUser(
+            id=record.id,
+            username=record.username,
+            role=record.role,
+            is_admin=record.is_admin,
+        )
+    user_cache.put(user_id, user)
+    return user
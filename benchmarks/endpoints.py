@@ -0,0 +1,305 @@
+"""Throughput and latency of every public endpoint, as JSON.
+
+    python -m benchmarks.endpoints [--seed 1000] [--requests 500] [--concurrency 20]
+
+Runs the app in-process, lifespan and outbox worker included, against a
+throwaway SQLite database and a local SMTP sink, after seeding ``--seed``
+bookings, contacts, reviews and users. Set BENCH_DATABASE_URL to run against
+another database, e.g. a disposable Postgres; its tables are created but
+never dropped. Save the output of two runs and diff them to compare releases.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmarks.smtp_sink import SMTPSink
+
+sink = SMTPSink().__enter__()
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL") or (
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(), "endpoints.db")
+)
+os.environ.update(
+    {
+        "SMTP_SERVER": sink.host,
+        "SMTP_PORT": str(sink.port),
+        "SMTP_USE_SSL": "false",
+        "SMTP_STARTTLS": "false",
+        "SMTP_USERNAME": "",
+        "FROM_EMAIL": "bench@example.com",
+        "ADMIN_EMAIL": "admin@example.com",
+    }
+)
+# Every request comes from one client; measure the endpoints, not the limiter
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+
+import main  # noqa: E402
+from database import SessionLocal, engine  # noqa: E402
+from models import Base, Booking, Contact, EmailOutbox, Review, User  # noqa: E402
+from utils import passwords  # noqa: E402
+from utils.capacity import BOOKING_SLOTS, rebuild_occupancy  # noqa: E402
+from utils.outbox_worker import drain_outbox  # noqa: E402
+from utils.ratings import rebuild_ratings  # noqa: E402
+
+PASSWORD = "bench-password"
+ADMIN_HEADERS = {"token": "bench", "role": "admin", "is-admin": "true"}
+FIRST_DAY = date(2030, 1, 1)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def _summary(latencies: list[float], elapsed: float, statuses: dict) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "statuses": statuses,
+        "throughput_rps": round(len(ordered) / elapsed, 2),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+async def seed(count: int):
+    """Insert ``count`` rows per table in bulk, bypassing the API."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # One hash for every user; hashing each would dominate the setup time
+    password_hash = await passwords.hash_password(PASSWORD)
+    async with SessionLocal() as db:
+        await db.execute(
+            insert(User),
+            [
+                {
+                    "username": f"bench_{i}",
+                    "email": f"bench_{i}@example.com",
+                    "first_name": "Bench",
+                    "last_name": f"User {i}",
+                    "password_hash": password_hash,
+                    "role": "admin",
+                    "is_admin": True,
+                }
+                for i in range(count)
+            ],
+        )
+        await db.execute(
+            insert(Booking),
+            [
+                {
+                    "customer_name": f"Guest {i}",
+                    "customer_email": f"guest_{i}@example.com",
+                    "customer_phone": "0700000000",
+                    "booking_date": FIRST_DAY - timedelta(days=1 + i % 365),
+                    "booking_time": BOOKING_SLOTS[i % len(BOOKING_SLOTS)],
+                    "party_size": 1 + i % 6,
+                }
+                for i in range(count)
+            ],
+        )
+        await db.execute(
+            insert(Contact),
+            [
+                {
+                    "name": f"Guest {i}",
+                    "email": f"guest_{i}@example.com",
+                    "subject": "Question",
+                    "message": "Do you cater for large events?",
+                }
+                for i in range(count)
+            ],
+        )
+        await db.execute(
+            insert(Review),
+            [
+                {
+                    "customer_name": f"Guest {i}",
+                    "customer_email": f"guest_{i}@example.com",
+                    "rating": 1 + i % 5,
+                    "comment": "Great nyama choma.",
+                    "menu_id": 1 + i % 20,
+                }
+                for i in range(count)
+            ],
+        )
+        await db.commit()
+
+        await rebuild_occupancy(db)
+        await rebuild_ratings(db)
+
+
+def scenarios(token: str) -> dict:
+    """Request builders per scenario, each called with the request number."""
+    slots = len(BOOKING_SLOTS)
+    return {
+        "POST /bookings": lambda i: (
+            "POST",
+            "/bookings",
+            {
+                "json": {
+                    "customer_name": f"Load {i}",
+                    "customer_email": f"load_{i}@example.com",
+                    "customer_phone": "0700000000",
+                    # Two seats per slot and day, well inside the capacity
+                    "booking_date": (
+                        FIRST_DAY + timedelta(days=i // slots)
+                    ).isoformat(),
+                    "booking_time": BOOKING_SLOTS[i % slots],
+                    "party_size": 2,
+                }
+            },
+        ),
+        "POST /contact": lambda i: (
+            "POST",
+            "/contact",
+            {
+                "json": {
+                    "name": f"Load {i}",
+                    "email": f"load_{i}@example.com",
+                    "subject": "Question",
+                    "message": "Are you open on public holidays?",
+                }
+            },
+        ),
+        "POST /reviews": lambda i: (
+            "POST",
+            "/reviews",
+            {
+                "json": {
+                    "customer_name": f"Load {i}",
+                    "customer_email": f"load_{i}@example.com",
+                    "rating": 1 + i % 5,
+                    "comment": "Tender and well seasoned.",
+                    "menu_id": 1 + i % 20,
+                }
+            },
+        ),
+        "POST /auth/login": lambda i: (
+            "POST",
+            "/auth/login",
+            {"json": {"username": "bench_0", "password": PASSWORD}},
+        ),
+        "GET /auth/verify": lambda i: (
+            "GET",
+            "/auth/verify",
+            {"headers": {"token": token}},
+        ),
+        "GET /bookings": lambda i: ("GET", "/bookings", {"headers": ADMIN_HEADERS}),
+        "GET /contact": lambda i: ("GET", "/contact", {"headers": ADMIN_HEADERS}),
+        "GET /reviews": lambda i: ("GET", "/reviews", {"headers": ADMIN_HEADERS}),
+        "GET /contact/search": lambda i: (
+            "GET",
+            "/contact/search",
+            {"params": {"q": "large events"}, "headers": ADMIN_HEADERS},
+        ),
+        "GET /reviews/search": lambda i: (
+            "GET",
+            "/reviews/search",
+            {"params": {"q": "nyama choma"}, "headers": ADMIN_HEADERS},
+        ),
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient, build, requests: int, concurrency: int
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses: dict[int, int] = {}
+
+    async def one(i: int) -> float:
+        method, url, kwargs = build(i)
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            elapsed = time.perf_counter() - started
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        return elapsed
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*[one(i) for i in range(requests)])
+    return _summary(latencies, time.perf_counter() - started, statuses)
+
+
+async def run(seed_rows: int, requests: int, concurrency: int, only: list[str]):
+    await seed(seed_rows)
+
+    results = {}
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            login = await client.post(
+                "/auth/login", json={"username": "bench_0", "password": PASSWORD}
+            )
+            login.raise_for_status()
+            for name, build in scenarios(login.json()["token"]).items():
+                if only and name not in only:
+                    continue
+                results[name] = await drive(client, build, requests, concurrency)
+
+        # Let the outbox catch up so the sink count covers every queued email
+        while await drain_outbox():
+            pass
+
+    async with SessionLocal() as db:
+        outbox = dict(
+            (
+                await db.execute(
+                    select(EmailOutbox.status, func.count()).group_by(
+                        EmailOutbox.status
+                    )
+                )
+            )
+            .tuples()
+            .all()
+        )
+    await engine.dispose()
+
+    return {
+        "database": engine.dialect.name,
+        "seed_rows": seed_rows,
+        "requests_per_scenario": requests,
+        "concurrency": concurrency,
+        "results": results,
+        "email": {
+            "outbox": outbox,
+            "smtp_connections": sink.connections,
+            "smtp_messages": sink.messages,
+        },
+    }
+
+
+def _main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        help='run just this scenario, e.g. "GET /bookings"; repeatable',
+    )
+    args = parser.parse_args()
+    try:
+        report = asyncio.run(run(args.seed, args.requests, args.concurrency, args.only))
+    finally:
+        sink.__exit__(None, None, None)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,122 @@
+"""Login throughput, and latency of another endpoint while logins are under load.
+
+    python -m benchmarks.login_load [--logins 200] [--concurrency 20]
+
+Runs the app in-process against a throwaway SQLite database. Set
+PASSWORD_WORKERS / BCRYPT_ROUNDS as you would in production to compare
+settings.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(
+    tempfile.mkdtemp(), "login_load.db"
+)
+os.environ.setdefault("OUTBOX_WORKER_ENABLED", "false")
+# Every request comes from one client; measure the endpoint, not the limiter
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from database import engine  # noqa: E402
+from models import Base  # noqa: E402
+from utils import passwords  # noqa: E402
+
+
+def _summary(latencies: list[float]) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 2),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+async def _timed(client: httpx.AsyncClient, method: str, url: str, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    return response.status_code, time.perf_counter() - started
+
+
+async def run(logins: int, concurrency: int) -> dict:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await client.post(
+            "/auth/register",
+            json={
+                "email": "bench@example.com",
+                "password": "bench-password",
+                "first_name": "bench",
+                "last_name": "user",
+            },
+        )
+        credentials = {"username": "bench", "password": "bench-password"}
+
+        # Baseline for the other endpoint, with no logins running
+        idle = [
+            (await _timed(client, "GET", "/bookings/availability?date=2026-01-01"))[1]
+            for _ in range(50)
+        ]
+
+        semaphore = asyncio.Semaphore(concurrency)
+        statuses: dict[int, int] = {}
+
+        async def login():
+            async with semaphore:
+                status, elapsed = await _timed(
+                    client, "POST", "/auth/login", json=credentials
+                )
+                statuses[status] = statuses.get(status, 0) + 1
+                return elapsed
+
+        async def probe(stop: asyncio.Event, samples: list[float]):
+            while not stop.is_set():
+                _, elapsed = await _timed(
+                    client, "GET", "/bookings/availability?date=2026-01-01"
+                )
+                samples.append(elapsed)
+                await asyncio.sleep(0.01)
+
+        stop = asyncio.Event()
+        loaded: list[float] = []
+        prober = asyncio.create_task(probe(stop, loaded))
+        started = time.perf_counter()
+        login_latencies = await asyncio.gather(*[login() for _ in range(logins)])
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await prober
+
+    passwords.shutdown()
+    return {
+        "bcrypt_rounds": passwords.BCRYPT_ROUNDS,
+        "password_workers": passwords.PASSWORD_WORKERS,
+        "concurrency": concurrency,
+        "login": {
+            "throughput_rps": round(logins / elapsed, 2),
+            "statuses": statuses,
+            **_summary(login_latencies),
+        },
+        "availability_idle": _summary(idle),
+        "availability_under_login_load": _summary(loaded),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.logins, args.concurrency)), indent=2))
@@ -0,0 +1,94 @@
+"""Compare the pydantic and orjson list response paths at 1k/10k/100k rows.
+
+    python -m benchmarks.serialization [sizes ...]
+
+Both paths fetch one page from an in-memory SQLite database and serialize it
+to the same JSON bytes; the pydantic path loads ORM objects and validates
+them through BookingPage, the fast path fetches column tuples and hands them
+to orjson.
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from models import Base, Booking  # noqa: E402
+from routers.schemas import BookingPage, BookingResponse  # noqa: E402
+from utils.serialization import dump_rows, response_columns  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def _seed(session: Session, count: int):
+    started = datetime(2025, 1, 1)
+    session.execute(
+        insert(Booking),
+        [
+            {
+                "customer_name": f"Customer {i}",
+                "customer_email": f"customer{i}@example.com",
+                "customer_phone": "+256700000000",
+                "booking_date": date(2025, 1, 1) + timedelta(days=i % 365),
+                "booking_time": "19:00",
+                "party_size": i % 12 + 1,
+                "special_requests": "Window seat please" if i % 3 else None,
+                "created_at": started + timedelta(seconds=i),
+            }
+            for i in range(count)
+        ],
+    )
+    session.commit()
+
+
+def _timed(fn) -> tuple[float, bytes]:
+    started = time.perf_counter()
+    body = fn()
+    return time.perf_counter() - started, body
+
+
+def pydantic_path(session: Session, count: int) -> bytes:
+    statement = select(Booking).order_by(Booking.created_at.desc(), Booking.id.desc())
+    items = session.execute(statement.limit(count)).scalars().all()
+    return BookingPage(items=items).model_dump_json().encode()
+
+
+def orjson_path(session: Session, count: int) -> bytes:
+    statement = select(*response_columns(Booking, BookingResponse)).order_by(
+        Booking.created_at.desc(), Booking.id.desc()
+    )
+    return dump_rows(session.execute(statement.limit(count)).all(), None)
+
+
+def main(sizes=SIZES):
+    results = []
+    for count in sizes:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            _seed(session, count)
+            slow, slow_body = _timed(lambda: pydantic_path(session, count))
+            session.expunge_all()
+            fast, fast_body = _timed(lambda: orjson_path(session, count))
+        engine.dispose()
+
+        assert json.loads(slow_body) == json.loads(fast_body)
+        results.append(
+            {
+                "rows": count,
+                "pydantic_ms": round(slow * 1000, 1),
+                "orjson_ms": round(fast * 1000, 1),
+                "speedup": round(slow / fast, 2),
+            }
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,54 @@
+"""Count SMTP handshakes per 100 messages, per-message connections vs the pool.
+
+    python -m benchmarks.smtp_handshakes [messages]
+"""
+import smtplib
+import sys
+import time
+from email.message import EmailMessage
+
+from benchmarks.smtp_sink import SMTPSink
+from utils.smtp_pool import SMTPSessionPool
+
+
+def _message(i: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "bench@example.com"
+    msg["To"] = "customer@example.com"
+    msg["Subject"] = f"Benchmark message {i}"
+    msg.set_content("Hello from the SMTP handshake benchmark.")
+    return msg
+
+
+def per_message(sink: SMTPSink, count: int) -> dict:
+    started = time.perf_counter()
+    for i in range(count):
+        with smtplib.SMTP(sink.host, sink.port) as smtp:
+            smtp.send_message(_message(i))
+    return {"connections": count, "seconds": time.perf_counter() - started}
+
+
+def pooled(sink: SMTPSink, count: int) -> dict:
+    pool = SMTPSessionPool(sink.host, sink.port, starttls=False)
+    started = time.perf_counter()
+    for i in range(count):
+        pool.send_message(_message(i))
+    elapsed = time.perf_counter() - started
+    pool.close()
+    return {"connections": pool.handshakes, "seconds": elapsed}
+
+
+def main(count: int = 100):
+    for name, run in (("per_message", per_message), ("pooled", pooled)):
+        with SMTPSink() as sink:
+            result = run(sink, count)
+            assert sink.messages == count
+            assert sink.connections == result["connections"]
+        print(
+            f"{name:>12}: {count} messages, {result['connections']} handshakes, "
+            f"{result['seconds'] * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -7,25 +7,37 @@ from fastapi import HTTPException, Header, Depends, status
 import jwt
 from zoneinfo import ZoneInfo
 from email.message import EmailMessage
-import smtplib
-from passlib.context import CryptContext
 import pytz
+from auth.tokens import decode_token
+from utils.passwords import pwd_context
+from utils.smtp_pool import FROM_EMAIL, smtp_pool
 
 
 nairobi_tz = ZoneInfo("Africa/Nairobi")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 load_dotenv()
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
 
 nairobi_tz = pytz.timezone("Africa/Nairobi")
 
 
+# The zone the naive timestamp columns hold. psycopg2 stored aware values
+# converted to the Postgres session TimeZone (SHOW TimeZone), UTC on the
+# hosted database, and database.py pins asyncpg sessions to the same zone
+db_tz = ZoneInfo(os.getenv("DB_TIMEZONE", "UTC"))
+
+
 def nairobi_now() -> datetime:
     return datetime.now(nairobi_tz)
 
 
+def db_now() -> datetime:
+    """Now as the timestamp columns store it: naive, in DB_TIMEZONE.
+
+    asyncpg refuses aware datetimes for columns without time zone.
+    """
+    return datetime.now(db_tz).replace(tzinfo=None)
+
+
 # format datetime to string "%d-%m-%Y %H:%M" from datetime object
 def format_datetime(dt: datetime) -> str:
     if not isinstance(dt, datetime):
@@ -49,7 +61,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def verify_token(token: Annotated[str, Header()]):
     try:
         # Decode the token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError:
@@ -71,11 +83,8 @@ def send_email(
     cc: list[str] = None,
     bcc: list[str] = None,
 ):
-    sender_email = os.getenv("APP_EMAIL")
-    app_password = os.getenv("APP_PASSWORD")
-
     msg = EmailMessage()
-    msg["From"] = sender_email
+    msg["From"] = FROM_EMAIL
     msg["To"] = ", ".join(to_emails)
     if cc:
         msg["Cc"] = ", ".join(cc)
@@ -85,9 +94,7 @@ def send_email(
     msg.set_content(body)
 
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
-            smtp.login(sender_email, app_password)
-            smtp.send_message(msg)
+        smtp_pool.send_message(msg)
         return True
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to send email")
@@ -116,7 +123,7 @@ def send_otp_email(to_email: str, otp: str):
 # --- Base dependency for all authenticated users ---
 def get_current_user_for_records(token: str = Header(...)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         user = payload.get("user")
         print("USER: ", user)
         if not user or user["role"] != "records" or not user["is_admin"]:
@@ -136,7 +143,7 @@ def require_records_admin(user=Depends(get_current_user_for_records)):
 
 def get_current_user_for_finance(token: str = Header(...)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         user = payload.get("user")
         print("USER: ", user)
         if not user or user["role"] != "finance" or not user["is_admin"]:
@@ -1,14 +1,50 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from routers.user_mgt import router as user_mngt_router
 from routers.bookings import router as bookings_router
 from routers.contact import router as contact_router
 from routers.reviews import router as reviews_router
-from fastapi.staticfiles import StaticFiles
+from routers.events import router as events_router
+from routers.sync import router as sync_router
+from database import engine, pool_stats
+from utils.outbox_worker import run_outbox_worker
+from utils.smtp_pool import smtp_pool
+from utils import passwords
+from utils.static_files import CachedStaticFiles
+from utils.compression import CompressionMiddleware
+from utils.idempotency import IdempotencyMiddleware
+from utils.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    instrument_engine,
+    render_metrics,
+)
+from utils.sql_profiler import SQLProfilerMiddleware, profile_engine
 import os
 
+OUTBOX_WORKER_ENABLED = os.getenv("OUTBOX_WORKER_ENABLED", "true").lower() == "true"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stop_event = asyncio.Event()
+    worker = None
+    if OUTBOX_WORKER_ENABLED:
+        worker = asyncio.create_task(run_outbox_worker(stop_event))
+    yield
+    stop_event.set()
+    if worker:
+        await worker
+    smtp_pool.close()
+    passwords.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+# Innermost, so replayed responses still go through CORS and compression
+app.add_middleware(IdempotencyMiddleware, paths=("/bookings", "/contact", "/reviews"))
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,15 +54,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Static files carry their own precompressed variants
+app.add_middleware(CompressionMiddleware, excluded_paths=("/Files",))
+app.add_middleware(SQLProfilerMiddleware)
+# Outermost, so latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+profile_engine(engine)
+
 app.include_router(user_mngt_router)
 app.include_router(bookings_router)
 app.include_router(contact_router)
 app.include_router(reviews_router)
+app.include_router(events_router)
+app.include_router(sync_router)
 
 uploads_path = os.path.join(os.path.dirname(__file__), "Files")
-app.mount("/Files", StaticFiles(directory=uploads_path), name="Files")
+app.mount("/Files", CachedStaticFiles(directory=uploads_path), name="Files")
 
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the YPA Mbuzi Choma Backend!"}
+
+
+@app.get("/health/pool")
+async def database_pool(
+    token: str = Header(...),
+    role: str = Header(...),
+    is_admin: str = Header(...),
+):
+    if is_admin.lower() != "true":
+        raise HTTPException(status_code=403, detail="Admins only")
+    return pool_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -10,11 +10,16 @@ from sqlalchemy import (
     Date,
     Boolean,
     Float,
+    Text,
+    Index,
+    LargeBinary,
+    DDL,
+    event,
+    func,
+    insert,
 )
-from dependencies import nairobi_now, nairobi_tz
+from dependencies import db_now, nairobi_tz
 from typing import List
-import uuid
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
 
 
 class Base(DeclarativeBase):
@@ -34,7 +39,7 @@ class User(Base):
     last_name: Mapped[str | None] = mapped_column(nullable=True)
     password_hash: Mapped[str] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=True, default=nairobi_now
+        DateTime, nullable=True, default=db_now
     )
     is_admin: Mapped[bool] = mapped_column(default=True, nullable=True)
     role: Mapped[str] = mapped_column(String(50), default="admin")
@@ -48,11 +53,36 @@ class Booking(Base):
     customer_name: Mapped[str] = mapped_column(String(100), nullable=False)
     customer_email: Mapped[str] = mapped_column(String(100), nullable=False)
     customer_phone: Mapped[str] = mapped_column(String(20), nullable=False)
-    booking_date: Mapped[date] = mapped_column(nullable=False)
+    booking_date: Mapped[date] = mapped_column(nullable=False, index=True)
     booking_time: Mapped[str] = mapped_column(String(20), nullable=False)
     party_size: Mapped[int] = mapped_column(nullable=False)
     special_requests: Mapped[str] = mapped_column(String(500), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=nairobi_now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=db_now)
+    # The server default fills existing rows when the column is added
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=db_now, onupdate=db_now, server_default=func.now()
+    )
+
+
+# Admin lists page newest-first on (created_at, id)
+Index(
+    "ix_bookings_created_at_id",
+    Booking.created_at.desc(),
+    Booking.id.desc(),
+)
+
+# /sync walks changes in (updated_at, id) order
+Index("ix_bookings_updated_at_id", Booking.updated_at, Booking.id)
+
+# Admin list filters; each one still pages newest-first off the same index.
+# booking_date ranges use ix_bookings_booking_date, and party_size is too
+# unselective to be worth an index of its own
+Index(
+    "ix_bookings_customer_email_created_at_id",
+    Booking.customer_email,
+    Booking.created_at.desc(),
+    Booking.id.desc(),
+)
 
 
 # Contact Model
@@ -65,7 +95,30 @@ class Contact(Base):
     phone: Mapped[str] = mapped_column(String(20), nullable=True)
     subject: Mapped[str] = mapped_column(String(150), nullable=False)
     message: Mapped[str] = mapped_column(String(1000), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=nairobi_now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=db_now)
+    # The server default fills existing rows when the column is added
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=db_now, onupdate=db_now, server_default=func.now()
+    )
+
+
+# Admin lists page newest-first on (created_at, id)
+Index(
+    "ix_contacts_created_at_id",
+    Contact.created_at.desc(),
+    Contact.id.desc(),
+)
+
+# /sync walks changes in (updated_at, id) order
+Index("ix_contacts_updated_at_id", Contact.updated_at, Contact.id)
+
+# Admin list filter by email, paging newest-first off the same index
+Index(
+    "ix_contacts_email_created_at_id",
+    Contact.email,
+    Contact.created_at.desc(),
+    Contact.id.desc(),
+)
 
 
 # Review Model
@@ -78,4 +131,229 @@ class Review(Base):
     rating: Mapped[int] = mapped_column(nullable=False)
     comment: Mapped[str] = mapped_column(String(1000), nullable=True)
     menu_id: Mapped[int] = mapped_column(nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=nairobi_now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=db_now)
+    # The server default fills existing rows when the column is added
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=db_now, onupdate=db_now, server_default=func.now()
+    )
+
+
+# Admin lists page newest-first on (created_at, id)
+Index(
+    "ix_reviews_created_at_id",
+    Review.created_at.desc(),
+    Review.id.desc(),
+)
+
+# /sync walks changes in (updated_at, id) order
+Index("ix_reviews_updated_at_id", Review.updated_at, Review.id)
+
+# Admin list filters, each paging newest-first off the same index
+Index(
+    "ix_reviews_menu_id_created_at_id",
+    Review.menu_id,
+    Review.created_at.desc(),
+    Review.id.desc(),
+)
+Index(
+    "ix_reviews_rating_created_at_id",
+    Review.rating,
+    Review.created_at.desc(),
+    Review.id.desc(),
+)
+Index(
+    "ix_reviews_customer_email_created_at_id",
+    Review.customer_email,
+    Review.created_at.desc(),
+    Review.id.desc(),
+)
+
+
+# Menu Rating Model, a per-dish rollup of reviews kept up to date on insert
+class MenuRating(Base):
+    __tablename__ = "menu_ratings"
+
+    menu_id: Mapped[int] = mapped_column(primary_key=True)
+    review_count: Mapped[int] = mapped_column(default=0)
+    rating_sum: Mapped[int] = mapped_column(default=0)
+    stars_1: Mapped[int] = mapped_column(default=0)
+    stars_2: Mapped[int] = mapped_column(default=0)
+    stars_3: Mapped[int] = mapped_column(default=0)
+    stars_4: Mapped[int] = mapped_column(default=0)
+    stars_5: Mapped[int] = mapped_column(default=0)
+
+
+# Slot Capacity Model, seats per booking time on a given weekday (0 = Monday)
+class SlotCapacity(Base):
+    __tablename__ = "slot_capacities"
+
+    weekday: Mapped[int] = mapped_column(primary_key=True)
+    booking_time: Mapped[str] = mapped_column(String(20), primary_key=True)
+    seats: Mapped[int] = mapped_column(nullable=False)
+
+
+# Slot Occupancy Model, seats already booked per date and time
+class SlotOccupancy(Base):
+    __tablename__ = "slot_occupancy"
+
+    booking_date: Mapped[date] = mapped_column(primary_key=True)
+    booking_time: Mapped[str] = mapped_column(String(20), primary_key=True)
+    seats_booked: Mapped[int] = mapped_column(default=0)
+
+
+# Email Outbox Model
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    # pending -> sending (leased to a worker) -> sent | dead, or back to
+    # pending to retry; admin notifications go held -> digested instead
+    status: Mapped[str] = mapped_column(String(20), default="pending")
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[str] = mapped_column(String(500), nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=db_now)
+    sent_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=db_now)
+
+
+# The worker only ever looks for due rows in a given status
+Index(
+    "ix_email_outbox_status_next_attempt_at",
+    EmailOutbox.status,
+    EmailOutbox.next_attempt_at,
+)
+
+
+# Idempotency Key Model, the stored outcome of a POST sent with Idempotency-Key
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(300), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="in_progress")
+    response_status: Mapped[int] = mapped_column(nullable=True)
+    response_headers: Mapped[str] = mapped_column(Text, nullable=True)
+    response_body: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=db_now)
+    # Short while in progress, so a crashed worker cannot hold a key for long
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+
+# Tombstone Model, one row per deleted booking, contact or review for /sync
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    resource: Mapped[str] = mapped_column(String(20), nullable=False)
+    row_id: Mapped[int] = mapped_column(nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, default=db_now)
+
+
+Index("ix_tombstones_deleted_at_id", Tombstone.deleted_at, Tombstone.id)
+
+
+# Record a tombstone whenever the ORM deletes a synced row. Bulk delete()
+# statements bypass this and must add their own tombstones.
+def _record_tombstone(resource: str):
+    def after_delete(mapper, connection, target):
+        connection.execute(
+            insert(Tombstone).values(
+                resource=resource, row_id=target.id, deleted_at=db_now()
+            )
+        )
+
+    return after_delete
+
+
+for _model, _resource in (
+    (Booking, "bookings"),
+    (Contact, "contacts"),
+    (Review, "reviews"),
+):
+    event.listen(_model, "after_delete", _record_tombstone(_resource))
+
+
+# Full-text search over contact and review text. Postgres keeps a generated
+# tsvector column with a GIN index; SQLite keeps an FTS5 index in step with
+# triggers. Neither is mapped: utils.search queries them directly.
+SEARCH_DOCUMENTS = {
+    "contacts": ("subject", "message"),
+    "reviews": ("comment",),
+}
+
+
+def is_search_object(type_: str, name: str) -> bool:
+    """Whether a reflected table, column or index was made by ``search_ddl``.
+
+    They are not in the metadata, so alembic autogenerate must skip them
+    rather than drop them.
+    """
+    if type_ == "table":
+        # FTS5 also creates shadow tables such as contacts_fts_data
+        return name.startswith(tuple(f"{table}_fts" for table in SEARCH_DOCUMENTS))
+    if type_ == "column":
+        return name == "search_vector"
+    if type_ == "index":
+        return name in {f"ix_{table}_search_vector" for table in SEARCH_DOCUMENTS}
+    return False
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """alembic ``include_object`` hook that keeps autogenerate off search objects.
+
+    Only objects found in the database with no metadata counterpart are
+    skipped, so a model column that happens to share a name still compares.
+    """
+    return not (reflected and compare_to is None and is_search_object(type_, name))
+
+
+def search_ddl(table: str, columns: tuple[str, ...]) -> dict[str, list[str]]:
+    """Statements creating the search index of ``table``, per dialect."""
+    vector = " || ".join(
+        f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(columns, "ABCD")
+    )
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    remove = (
+        f"INSERT INTO {table}_fts({table}_fts, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    add = f"INSERT INTO {table}_fts(rowid, {names}) VALUES (new.id, {new});"
+    return {
+        "postgresql": [
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({vector}) STORED",
+            f"CREATE INDEX ix_{table}_search_vector ON {table} "
+            "USING gin (search_vector)",
+        ],
+        "sqlite": [
+            f"CREATE VIRTUAL TABLE {table}_fts USING fts5("
+            f"{names}, content='{table}', content_rowid='id')",
+            f"CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} "
+            f"BEGIN {add} END",
+            f"CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} "
+            f"BEGIN {remove} END",
+            f"CREATE TRIGGER {table}_fts_update AFTER UPDATE ON {table} "
+            f"BEGIN {remove} {add} END",
+        ],
+    }
+
+
+for _table, _columns in SEARCH_DOCUMENTS.items():
+    for _dialect, _statements in search_ddl(_table, _columns).items():
+        for _statement in _statements:
+            event.listen(
+                Base.metadata.tables[_table],
+                "after_create",
+                DDL(_statement).execute_if(dialect=_dialect),
+            )
+    event.listen(
+        Base.metadata.tables[_table],
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {_table}_fts").execute_if(dialect="sqlite"),
+    )
@@ -1,16 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from models import Booking
-from routers.schemas import BookingCreate, BookingResponse
-from utils.email_utils import send_email, ADMIN_EMAIL
+from routers.schemas import (
+    BookingCreate,
+    BookingFieldsPage,
+    BookingPage,
+    BookingResponse,
+    SlotAvailability,
+)
+from utils.capacity import availability, reserve_seats
+from utils.email_utils import (
+    ADMIN_URGENT_PARTY_SIZE,
+    queue_admin_notification,
+    queue_email,
+)
+from utils.events import publish_row
+from utils.export import ExportFormat, export_response, export_statement
+from utils.http_cache import cached_json_response, mark_changed
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.rate_limit import rate_limit
+from utils.serialization import page_json, parse_fields
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 
-@router.post("", response_model=BookingResponse)
-def create_booking(request: BookingCreate, db: Session = Depends(get_db)):
+@router.post(
+    "",
+    response_model=BookingResponse,
+    dependencies=[Depends(rate_limit("bookings", "customer_email"))],
+)
+async def create_booking(request: BookingCreate, db: AsyncSession = Depends(get_db)):
+    await reserve_seats(
+        db, request.booking_date, request.booking_time, request.party_size
+    )
+
     new_booking = Booking(
         customer_name=request.customer_name,
         customer_email=request.customer_email,
@@ -21,10 +48,8 @@ def create_booking(request: BookingCreate, db: Session = Depends(get_db)):
         special_requests=request.special_requests,
     )
     db.add(new_booking)
-    db.commit()
-    db.refresh(new_booking)
 
-    # Send confirmation email to customer
+    # Queue confirmation email to customer
     customer_subject = "Your Booking Confirmation - YPA Mbuzi Choma"
     customer_body = f"""
 Hi {new_booking.customer_name},
@@ -41,9 +66,9 @@ We will confirm your reservation within 2 hours during business hours.
 Best regards,
 YPA Mbuzi Choma Team
 """
-    send_email(new_booking.customer_email, customer_subject, customer_body)
+    queue_email(db, new_booking.customer_email, customer_subject, customer_body)
 
-    # Notify admin
+    # Notify admin; large parties are flagged straight away
     admin_subject = "New Booking Received"
     admin_body = f"""
 New booking submitted:
@@ -56,20 +81,87 @@ Time: {new_booking.booking_time}
 Party Size: {new_booking.party_size}
 Special Requests: {new_booking.special_requests or "None"}
 """
-    send_email(ADMIN_EMAIL, admin_subject, admin_body)
+    queue_admin_notification(
+        db,
+        admin_subject,
+        admin_body,
+        urgent=new_booking.party_size >= ADMIN_URGENT_PARTY_SIZE,
+    )
+
+    # The emails are delivered by the outbox worker once this commits
+    await db.commit()
+    await db.refresh(new_booking)
+    mark_changed("bookings")
+    publish_row("bookings", new_booking)
 
     return new_booking
 
 
 
 
-@router.get("", response_model=list[BookingResponse])
-def list_bookings(
-    db: Session = Depends(get_db),
+@router.get("", response_model=BookingPage | BookingFieldsPage)
+async def list_bookings(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    party_size_min: int | None = Query(None, ge=1),
+    party_size_max: int | None = Query(None, ge=1),
+    email: str | None = None,
+    token: str = Header(...),
+    role: str = Header(...),
+    is_admin: str = Header(...),
+):
+    if is_admin.lower() != "true":
+        raise HTTPException(status_code=403, detail="Admins only")
+
+    columns = parse_fields(BookingResponse, fields)
+    filters = []
+    if date_from:
+        filters.append(Booking.booking_date >= date_from)
+    if date_to:
+        filters.append(Booking.booking_date <= date_to)
+    if party_size_min:
+        filters.append(Booking.party_size >= party_size_min)
+    if party_size_max:
+        filters.append(Booking.party_size <= party_size_max)
+    if email:
+        filters.append(Booking.customer_email == email)
+
+    async def build() -> bytes:
+        return await page_json(
+            db, Booking, BookingResponse, BookingPage, limit, cursor, columns, filters
+        )
+
+    return await cached_json_response(request, "bookings", build)
+
+
+@router.get("/availability", response_model=list[SlotAvailability])
+async def booking_availability(
+    day: date = Query(alias="date"), db: AsyncSession = Depends(get_db)
+):
+    return await availability(db, day)
+
+
+@router.get("/export")
+async def export_bookings(
+    format: ExportFormat = "ndjson",
+    date_from: date | None = None,
+    date_to: date | None = None,
     token: str = Header(...),
     role: str = Header(...),
     is_admin: str = Header(...),
 ):
     if is_admin.lower() != "true":
         raise HTTPException(status_code=403, detail="Admins only")
-    return db.query(Booking).order_by(Booking.created_at.desc()).all()
+
+    columns = list(BookingResponse.model_fields)
+    statement = export_statement(Booking, columns)
+    if date_from:
+        statement = statement.where(Booking.booking_date >= date_from)
+    if date_to:
+        statement = statement.where(Booking.booking_date <= date_to)
+    return export_response(statement, columns, "bookings", format)
@@ -1,16 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from datetime import date
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Header,
+    Query,
+    Request,
+    Response,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from models import Contact
-from routers.schemas import ContactCreate, ContactResponse
-from utils.email_utils import send_email, ADMIN_EMAIL
+from routers.schemas import (
+    ContactCreate,
+    ContactFieldsPage,
+    ContactPage,
+    ContactResponse,
+)
+from utils.email_utils import queue_admin_notification, queue_email
+from utils.events import publish_row
+from utils.export import (
+    ExportFormat,
+    created_between,
+    export_response,
+    export_statement,
+    filter_created_at,
+)
+from utils.http_cache import cached_json_response, mark_changed
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.rate_limit import rate_limit
+from utils.search import search_json
+from utils.serialization import page_json, parse_fields
 
 router = APIRouter(prefix="/contact", tags=["contact"])
 
 
-@router.post("", response_model=ContactResponse)
-def submit_contact(request: ContactCreate, db: Session = Depends(get_db)):
+@router.post(
+    "",
+    response_model=ContactResponse,
+    dependencies=[Depends(rate_limit("contact", "email"))],
+)
+async def submit_contact(request: ContactCreate, db: AsyncSession = Depends(get_db)):
     new_contact = Contact(
         name=request.name,
         email=request.email,
@@ -19,10 +51,8 @@ def submit_contact(request: ContactCreate, db: Session = Depends(get_db)):
         message=request.message,
     )
     db.add(new_contact)
-    db.commit()
-    db.refresh(new_contact)
 
-    # Send confirmation email to customer
+    # Queue confirmation email to customer
     customer_subject = "We Received Your Message - YPA Mbuzi Choma"
     customer_body = f"""
 Hi {new_contact.name},
@@ -36,7 +66,7 @@ Message you sent:
 Best regards,
 YPA Mbuzi Choma Team
 """
-    send_email(new_contact.email, customer_subject, customer_body)
+    queue_email(db, new_contact.email, customer_subject, customer_body)
 
     # Notify admin
     admin_subject = "New Contact Form Submission"
@@ -49,19 +79,80 @@ Phone: {new_contact.phone or "N/A"}
 Subject: {new_contact.subject}
 Message: {new_contact.message}
 """
-    send_email(ADMIN_EMAIL, admin_subject, admin_body)
+    queue_admin_notification(db, admin_subject, admin_body)
+
+    # The emails are delivered by the outbox worker once this commits
+    await db.commit()
+    await db.refresh(new_contact)
+    mark_changed("contacts")
+    publish_row("contacts", new_contact)
 
     return new_contact
 
 
 
-@router.get("", response_model=list[ContactResponse])
-def list_contacts(
-    db: Session = Depends(get_db),
+@router.get("", response_model=ContactPage | ContactFieldsPage)
+async def list_contacts(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    email: str | None = None,
+    token: str = Header(...),
+    role: str = Header(...),
+    is_admin: str = Header(...),
+):
+    if is_admin.lower() != "true":
+        raise HTTPException(status_code=403, detail="Admins only")
+
+    columns = parse_fields(ContactResponse, fields)
+    filters = created_between(Contact, date_from, date_to)
+    if email:
+        filters.append(Contact.email == email)
+
+    async def build() -> bytes:
+        return await page_json(
+            db, Contact, ContactResponse, ContactPage, limit, cursor, columns, filters
+        )
+
+    return await cached_json_response(request, "contacts", build)
+
+
+@router.get("/search", response_model=ContactPage)
+async def search_contacts(
+    q: str = Query(..., min_length=1, max_length=200),
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    token: str = Header(...),
+    role: str = Header(...),
+    is_admin: str = Header(...),
+):
+    """Contact messages matching ``q`` in their subject or text, best first."""
+    if is_admin.lower() != "true":
+        raise HTTPException(status_code=403, detail="Admins only")
+
+    body = await search_json(db, Contact, ContactResponse, q, limit, cursor)
+    return Response(body, media_type="application/json")
+
+
+@router.get("/export")
+async def export_contacts(
+    format: ExportFormat = "ndjson",
+    date_from: date | None = None,
+    date_to: date | None = None,
     token: str = Header(...),
     role: str = Header(...),
     is_admin: str = Header(...),
 ):
     if is_admin.lower() != "true":
         raise HTTPException(status_code=403, detail="Admins only")
-    return db.query(Contact).order_by(Contact.created_at.desc()).all()
+
+    columns = list(ContactResponse.model_fields)
+    statement = filter_created_at(
+        export_statement(Contact, columns), Contact, date_from, date_to
+    )
+    return export_response(statement, columns, "contacts", format)
@@ -0,0 +1,94 @@
+import orjson
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from auth.dependencies import get_current_user
+from auth.user_cache import CachedUser
+from utils.events import feed
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# How long browsers wait before reconnecting a dropped stream
+SSE_RETRY_MS = 3000
+
+
+async def _require_admin(token: str | None) -> CachedUser:
+    if not token:
+        raise HTTPException(status_code=401, detail="Missing token")
+    user = await get_current_user(token)
+    if not user.is_admin:
+        raise HTTPException(status_code=403, detail="Admins only")
+    return user
+
+
+def _sse_message(event_id: str, event: str, data: dict) -> bytes:
+    if event == "heartbeat":
+        return b": heartbeat\n\n"
+    return (
+        f"id: {event_id}\nevent: {event}\ndata: ".encode()
+        + orjson.dumps(data)
+        + b"\n\n"
+    )
+
+
+async def _sse_stream(last_event_id: str | None):
+    yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+    async for event_id, event, data in feed(last_event_id):
+        yield _sse_message(event_id, event, data)
+
+
+# -----------------------
+# SERVER-SENT EVENTS
+# -----------------------
+@router.get("")
+async def admin_events(
+    token: str | None = Header(None),
+    token_param: str | None = Query(None, alias="token"),
+    last_event_id: str | None = Header(None),
+    last_event_id_param: str | None = Query(None, alias="last_event_id"),
+):
+    """New bookings, contacts and reviews as they arrive, as Server-Sent Events.
+
+    EventSource cannot set headers, so the token may also be passed as
+    ``?token=``. Browsers resend Last-Event-ID on reconnect by themselves.
+    """
+    await _require_admin(token or token_param)
+    return StreamingResponse(
+        _sse_stream(last_event_id or last_event_id_param),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# -----------------------
+# WEBSOCKET
+# -----------------------
+@router.websocket("/ws")
+async def admin_events_ws(
+    websocket: WebSocket,
+    token: str | None = Query(None),
+    last_event_id: str | None = Query(None),
+):
+    try:
+        await _require_admin(token or websocket.headers.get("token"))
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+
+    await websocket.accept()
+    try:
+        async for event_id, event, data in feed(last_event_id):
+            message = {"id": event_id, "event": event, "data": data}
+            await websocket.send_text(orjson.dumps(message).decode())
+    except WebSocketDisconnect:
+        return
+    # The feed ended because this client fell behind; it should reconnect
+    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
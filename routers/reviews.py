@@ -1,16 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from datetime import date
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Header,
+    Query,
+    Request,
+    Response,
+)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
-from models import Review
-from routers.schemas import ReviewCreate, ReviewResponse
-from utils.email_utils import send_email, ADMIN_EMAIL
+from models import MenuRating, Review
+from routers.schemas import (
+    MenuRatingSummary,
+    ReviewCreate,
+    ReviewFieldsPage,
+    ReviewPage,
+    ReviewResponse,
+)
+from utils.email_utils import queue_admin_notification, queue_email
+from utils.events import publish_row
+from utils.export import (
+    ExportFormat,
+    created_between,
+    export_response,
+    export_statement,
+    filter_created_at,
+)
+from utils.http_cache import cached_json_response, mark_changed
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.rate_limit import rate_limit
+from utils.search import search_json
+from utils.serialization import page_json, parse_fields
+from utils.ratings import record_rating, to_summary
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 
-@router.post("", response_model=ReviewResponse)
-def submit_review(request: ReviewCreate, db: Session = Depends(get_db)):
+@router.post(
+    "",
+    response_model=ReviewResponse,
+    dependencies=[Depends(rate_limit("reviews", "customer_email"))],
+)
+async def submit_review(request: ReviewCreate, db: AsyncSession = Depends(get_db)):
     new_review = Review(
         customer_name=request.customer_name,
         customer_email=request.customer_email,
@@ -19,10 +54,9 @@ def submit_review(request: ReviewCreate, db: Session = Depends(get_db)):
         menu_id=request.menu_id,
     )
     db.add(new_review)
-    db.commit()
-    db.refresh(new_review)
+    await record_rating(db, new_review.menu_id, new_review.rating)
 
-    # Send confirmation email to customer
+    # Queue confirmation email to customer
     customer_subject = "Thank You for Your Review - YPA Mbuzi Choma"
     customer_body = f"""
 Hi {new_review.customer_name},
@@ -36,7 +70,7 @@ Comment: {new_review.comment or "No comment"}
 Best regards,
 YPA Mbuzi Choma Team
 """
-    send_email(new_review.customer_email, customer_subject, customer_body)
+    queue_email(db, new_review.customer_email, customer_subject, customer_body)
 
     # Notify admin
     admin_subject = "New Customer Review"
@@ -48,19 +82,97 @@ Email: {new_review.customer_email}
 Rating: {new_review.rating}/5
 Comment: {new_review.comment or "No comment"}
 """
-    send_email(ADMIN_EMAIL, admin_subject, admin_body)
+    queue_admin_notification(db, admin_subject, admin_body)
+
+    # The emails are delivered by the outbox worker once this commits
+    await db.commit()
+    await db.refresh(new_review)
+    mark_changed("reviews")
+    publish_row("reviews", new_review)
 
     return new_review
 
 
 
-@router.get("", response_model=list[ReviewResponse])
-def list_reviews(
-    db: Session = Depends(get_db),
+@router.get("", response_model=ReviewPage | ReviewFieldsPage)
+async def list_reviews(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    rating: int | None = Query(None, ge=1, le=5),
+    menu_id: int | None = None,
+    email: str | None = None,
+    token: str = Header(...),
+    role: str = Header(...),
+    is_admin: str = Header(...),
+):
+    if is_admin.lower() != "true":
+        raise HTTPException(status_code=403, detail="Admins only")
+
+    columns = parse_fields(ReviewResponse, fields)
+    filters = created_between(Review, date_from, date_to)
+    if rating:
+        filters.append(Review.rating == rating)
+    if menu_id is not None:
+        filters.append(Review.menu_id == menu_id)
+    if email:
+        filters.append(Review.customer_email == email)
+
+    async def build() -> bytes:
+        return await page_json(
+            db, Review, ReviewResponse, ReviewPage, limit, cursor, columns, filters
+        )
+
+    return await cached_json_response(request, "reviews", build)
+
+
+@router.get("/search", response_model=ReviewPage)
+async def search_reviews(
+    q: str = Query(..., min_length=1, max_length=200),
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    token: str = Header(...),
+    role: str = Header(...),
+    is_admin: str = Header(...),
+):
+    """Reviews whose comment matches ``q``, best match first."""
+    if is_admin.lower() != "true":
+        raise HTTPException(status_code=403, detail="Admins only")
+
+    body = await search_json(db, Review, ReviewResponse, q, limit, cursor)
+    return Response(body, media_type="application/json")
+
+
+@router.get("/export")
+async def export_reviews(
+    format: ExportFormat = "ndjson",
+    date_from: date | None = None,
+    date_to: date | None = None,
     token: str = Header(...),
     role: str = Header(...),
     is_admin: str = Header(...),
 ):
     if is_admin.lower() != "true":
         raise HTTPException(status_code=403, detail="Admins only")
-    return db.query(Review).order_by(Review.created_at.desc()).all()
+
+    columns = list(ReviewResponse.model_fields)
+    statement = filter_created_at(
+        export_statement(Review, columns), Review, date_from, date_to
+    )
+    return export_response(statement, columns, "reviews", format)
+
+
+@router.get("/summary", response_model=list[MenuRatingSummary])
+async def list_rating_summaries(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(MenuRating).order_by(MenuRating.menu_id))
+    return [to_summary(rollup.menu_id, rollup) for rollup in result.scalars()]
+
+
+@router.get("/summary/{menu_id}", response_model=MenuRatingSummary)
+async def get_rating_summary(menu_id: int, db: AsyncSession = Depends(get_db)):
+    return to_summary(menu_id, await db.get(MenuRating, menu_id))
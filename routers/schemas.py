@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from enum import Enum
 from datetime import date, datetime
@@ -73,7 +73,7 @@ class BookingCreate(BaseModel):
     customer_phone: str
     booking_date: date
     booking_time: str
-    party_size: int
+    party_size: int = Field(ge=1)
     special_requests: str | None = None
 
 
@@ -92,6 +92,37 @@ class BookingResponse(BaseModel):
         from_attributes = True
 
 
+class BookingPage(BaseModel):
+    items: list[BookingResponse]
+    next_cursor: str | None = None
+
+
+class BookingFields(BaseModel):
+    """A booking narrowed by ``fields=``; only requested keys are present."""
+
+    id: int
+    customer_name: str | None = None
+    customer_email: EmailStr | None = None
+    customer_phone: str | None = None
+    booking_date: date | None = None
+    booking_time: str | None = None
+    party_size: int | None = None
+    special_requests: str | None = None
+    created_at: datetime
+
+
+class BookingFieldsPage(BaseModel):
+    items: list[BookingFields]
+    next_cursor: str | None = None
+
+
+class SlotAvailability(BaseModel):
+    booking_time: str
+    capacity: int
+    booked: int
+    available: int
+
+
 ## ======================
 ## CONTACT SCHEMAS
 ## ======================
@@ -116,13 +147,35 @@ class ContactResponse(BaseModel):
         from_attributes = True
 
 
+class ContactPage(BaseModel):
+    items: list[ContactResponse]
+    next_cursor: str | None = None
+
+
+class ContactFields(BaseModel):
+    """A contact message narrowed by ``fields=``; only requested keys are present."""
+
+    id: int
+    name: str | None = None
+    email: EmailStr | None = None
+    phone: str | None = None
+    subject: str | None = None
+    message: str | None = None
+    created_at: datetime
+
+
+class ContactFieldsPage(BaseModel):
+    items: list[ContactFields]
+    next_cursor: str | None = None
+
+
 ## ======================
 ## REVIEW SCHEMAS
 ## ======================
 class ReviewCreate(BaseModel):
     customer_name: str
     customer_email: EmailStr
-    rating: int
+    rating: int = Field(ge=1, le=5)
     comment: str
     menu_id: int
 
@@ -140,3 +193,48 @@ class ReviewResponse(BaseModel):
         from_attributes = True
 
 
+class ReviewPage(BaseModel):
+    items: list[ReviewResponse]
+    next_cursor: str | None = None
+
+
+class ReviewFields(BaseModel):
+    """A review narrowed by ``fields=``; only requested keys are present."""
+
+    id: int
+    customer_name: str | None = None
+    customer_email: EmailStr | None = None
+    rating: int | None = None
+    comment: str | None = None
+    menu_id: int | None = None
+    created_at: datetime
+
+
+class ReviewFieldsPage(BaseModel):
+    items: list[ReviewFields]
+    next_cursor: str | None = None
+
+
+class MenuRatingSummary(BaseModel):
+    menu_id: int
+    review_count: int
+    average_rating: float | None
+    histogram: dict[int, int]
+
+
+## ======================
+## SYNC SCHEMAS
+## ======================
+class SyncDeleted(BaseModel):
+    bookings: list[int]
+    contacts: list[int]
+    reviews: list[int]
+
+
+class SyncResponse(BaseModel):
+    bookings: list[BookingResponse]
+    contacts: list[ContactResponse]
+    reviews: list[ReviewResponse]
+    deleted: SyncDeleted
+    next_token: str
+    has_more: bool
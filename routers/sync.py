@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_db
+from routers.schemas import SyncResponse
+from utils.sync import changes_since
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+    since: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    token: str = Header(...),
+    role: str = Header(...),
+    is_admin: str = Header(...),
+):
+    """Bookings, contacts and reviews created, changed or deleted since ``since``.
+
+    Leave ``since`` out for a full download, then pass back ``next_token``
+    each time; while ``has_more`` is true, call again straight away. A row
+    may be sent again on the next call, so apply rows as upserts.
+    """
+    if is_admin.lower() != "true":
+        raise HTTPException(status_code=403, detail="Admins only")
+
+    return await changes_since(db, since)
@@ -1,10 +1,9 @@
 # routers/user_mgt.py
-import os
 import jwt
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from routers.schemas import (
     LoginRequest,
     LoginResponse,
@@ -15,12 +14,13 @@ from routers.schemas import (
 from database import get_db
 from models import User
 from dotenv import load_dotenv
+from auth.tokens import ALGORITHM, SECRET_KEY, decode_token
+from auth.user_cache import invalidate_user
+from utils.passwords import hash_password, verify_password
+from utils.rate_limit import rate_limit
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 load_dotenv()
 
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "super-secret-key")
-ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -29,12 +29,27 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 # -----------------------
 # LOGIN
 # -----------------------
-@router.post("/login", response_model=LoginResponse)
-def login_user(request: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == request.username).first()
-    if not user or not pwd_context.verify(request.password, user.password_hash):
+@router.post(
+    "/login",
+    response_model=LoginResponse,
+    dependencies=[Depends(rate_limit("login", "username"))],
+)
+async def login_user(request: LoginRequest, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).where(User.username == request.username))
+    user = result.scalars().first()
+    if not user or not user.password_hash:
+        raise HTTPException(status_code=401, detail="Invalid username or password")
+
+    valid, new_hash = await verify_password(request.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
+    # Re-hash with the current bcrypt cost while we have the plain password
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+        invalidate_user(user.id)
+
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {
         "sub": str(user.id),
@@ -55,12 +70,13 @@ def login_user(request: LoginRequest, db: Session = Depends(get_db)):
 # REGISTER
 # -----------------------
 @router.post("/register")
-def register_user(request: RegisterRequest, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == request.email).first()
+async def register_user(request: RegisterRequest, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).where(User.email == request.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = pwd_context.hash(request.password)
+    hashed_password = await hash_password(request.password)
     new_user = User(
         username=request.first_name.lower().replace(
             " ", "_"
@@ -72,8 +88,9 @@ def register_user(request: RegisterRequest, db: Session = Depends(get_db)):
         role="admin",
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    invalidate_user(new_user.id)
 
     return {
         "message": "User registered successfully",
@@ -90,9 +107,9 @@ def register_user(request: RegisterRequest, db: Session = Depends(get_db)):
 # VERIFY TOKEN
 # -----------------------
 @router.get("/verify", response_model=VerifyResponse)
-def verify_token(token: str = Header(...)):
+async def verify_token(token: str = Header(...)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         user_data = payload.get("user")
         if not user_data:
             raise HTTPException(status_code=401, detail="Invalid token")
@@ -0,0 +1,73 @@
+"""The app against a throwaway database and a local SMTP sink.
+
+The suite runs on aiosqlite by default. Set TEST_DATABASE_URL to a
+disposable Postgres database to run it through asyncpg instead; its tables
+are dropped and recreated for every test.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from benchmarks.smtp_sink import SMTPSink
+
+sink = SMTPSink().__enter__()
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or (
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+)
+os.environ.update(
+    {
+        "SMTP_SERVER": sink.host,
+        "SMTP_PORT": str(sink.port),
+        "SMTP_USE_SSL": "false",
+        "SMTP_STARTTLS": "false",
+        "SMTP_USERNAME": "",
+        "FROM_EMAIL": "test@example.com",
+        "ADMIN_EMAIL": "admin@example.com",
+        # Tests drain the outbox themselves
+        "OUTBOX_WORKER_ENABLED": "false",
+        "RATE_LIMIT_ENABLED": "false",
+        "LIST_CACHE_TTL": "0",
+        "BCRYPT_ROUNDS": "4",
+    }
+)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from database import engine  # noqa: E402
+from models import Base  # noqa: E402
+
+ADMIN_HEADERS = {"token": "test", "role": "admin", "is-admin": "true"}
+
+
+async def _reset_schema():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as client:
+        client.portal.call(_reset_schema)
+        yield client
+        # Pooled connections belong to this client's event loop
+        client.portal.call(engine.dispose)
+
+
+@pytest.fixture
+def run(client):
+    """Run a coroutine function on the app's event loop: ``run(fn, *args)``."""
+    return client.portal.call
+
+
+@pytest.fixture
+def admin_headers():
+    return dict(ADMIN_HEADERS)
+
+
+@pytest.fixture
+def smtp_sink():
+    return sink
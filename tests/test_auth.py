@@ -0,0 +1,60 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from utils import passwords
+
+
+def test_register_login_and_verify(client):
+    registered = client.post(
+        "/auth/register",
+        json={
+            "email": "admin@example.com",
+            "password": "s3cret-pass",
+            "first_name": "Mary",
+            "last_name": "Njeri",
+        },
+    )
+    assert registered.status_code == 200
+
+    login = client.post(
+        "/auth/login", json={"username": "mary", "password": "s3cret-pass"}
+    )
+    assert login.status_code == 200
+    token = login.json()["token"]
+
+    verified = client.get("/auth/verify", headers={"token": token})
+    assert verified.status_code == 200
+    assert verified.json()["username"] == "mary"
+
+
+def test_login_rejects_wrong_password(client):
+    client.post(
+        "/auth/register",
+        json={
+            "email": "admin@example.com",
+            "password": "s3cret-pass",
+            "first_name": "Mary",
+            "last_name": "Njeri",
+        },
+    )
+    login = client.post("/auth/login", json={"username": "mary", "password": "nope"})
+    assert login.status_code == 401
+
+
+def test_broken_password_pool_is_replaced():
+    async def hash_after_worker_dies():
+        executor = passwords._get_executor()
+        with pytest.raises(BrokenProcessPool):
+            executor.submit(os._exit, 1).result()
+        password_hash = await passwords.hash_password("s3cret-pass")
+        return executor, password_hash
+
+    try:
+        broken, password_hash = asyncio.run(hash_after_worker_dies())
+        assert passwords._executor is not broken
+        assert passwords.pwd_context.verify("s3cret-pass", password_hash)
+    finally:
+        passwords.shutdown()
@@ -0,0 +1,103 @@
+from sqlalchemy import func, select
+
+from database import SessionLocal
+from models import EmailOutbox
+from routers.schemas import BookingFieldsPage
+from utils.capacity import DEFAULT_SLOT_SEATS
+from utils.outbox_worker import drain_outbox
+
+
+def booking(**overrides) -> dict:
+    return {
+        "customer_name": "Achieng",
+        "customer_email": "achieng@example.com",
+        "customer_phone": "0700000000",
+        "booking_date": "2030-01-04",
+        "booking_time": "19:00",
+        "party_size": 4,
+        **overrides,
+    }
+
+
+async def _outbox_statuses() -> dict[str, int]:
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)
+        )
+        return dict(result.tuples().all())
+
+
+def test_create_booking_queues_emails(client, run, smtp_sink):
+    response = client.post("/bookings", json=booking())
+    assert response.status_code == 200
+    assert response.json()["customer_name"] == "Achieng"
+
+    # Customer confirmation, and the admin notification held for the digest
+    assert run(_outbox_statuses) == {"pending": 1, "held": 1}
+
+    before = smtp_sink.messages
+    assert run(drain_outbox) == 1
+    assert smtp_sink.messages == before + 1
+    assert run(_outbox_statuses) == {"sent": 1, "held": 1}
+
+
+def test_list_bookings_pages_newest_first(client, admin_headers):
+    for i in range(3):
+        client.post("/bookings", json=booking(customer_name=f"Guest {i}"))
+
+    first = client.get("/bookings", params={"limit": 2}, headers=admin_headers)
+    assert first.status_code == 200
+    page = first.json()
+    assert [item["customer_name"] for item in page["items"]] == ["Guest 2", "Guest 1"]
+
+    second = client.get(
+        "/bookings",
+        params={"limit": 2, "cursor": page["next_cursor"]},
+        headers=admin_headers,
+    )
+    page = second.json()
+    assert [item["customer_name"] for item in page["items"]] == ["Guest 0"]
+    assert page["next_cursor"] is None
+
+
+def test_projected_bookings_match_the_documented_schema(client, admin_headers):
+    client.post("/bookings", json=booking())
+
+    response = client.get(
+        "/bookings", params={"fields": "customer_name"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    page = BookingFieldsPage.model_validate(response.json())
+    assert set(page.items[0].model_fields_set) == {"id", "customer_name", "created_at"}
+
+    schema = client.get("/openapi.json").json()
+    documented = schema["paths"]["/bookings"]["get"]["responses"]["200"]
+    refs = {
+        option["$ref"].rsplit("/", 1)[-1]
+        for option in documented["content"]["application/json"]["schema"]["anyOf"]
+    }
+    assert refs == {"BookingPage", "BookingFieldsPage"}
+
+
+def test_list_bookings_requires_admin(client, admin_headers):
+    headers = {**admin_headers, "is-admin": "false"}
+    assert client.get("/bookings", headers=headers).status_code == 403
+
+
+def test_full_slot_rejects_booking(client):
+    full = booking(party_size=DEFAULT_SLOT_SEATS)
+    assert client.post("/bookings", json=full).status_code == 200
+    assert client.post("/bookings", json=booking(party_size=1)).status_code == 409
+
+    slots = client.get("/bookings/availability", params={"date": "2030-01-04"})
+    slot = next(s for s in slots.json() if s["booking_time"] == "19:00")
+    assert slot["available"] == 0
+
+
+def test_unknown_booking_time_is_rejected(client):
+    for booking_time in ("3am", "12:00 ", "12pm"):
+        response = client.post("/bookings", json=booking(booking_time=booking_time))
+        assert response.status_code == 422
+
+    listed = client.get("/bookings/availability", params={"date": "2030-01-04"})
+    assert all(slot["booked"] == 0 for slot in listed.json())
@@ -0,0 +1,47 @@
+def contact(**overrides) -> dict:
+    return {
+        "name": "Wanjiru",
+        "email": "wanjiru@example.com",
+        "phone": "0711000000",
+        "subject": "Catering",
+        "message": "Do you cater for a wedding of 200 guests?",
+        **overrides,
+    }
+
+
+def test_submit_and_list_contacts(client, admin_headers):
+    response = client.post("/contact", json=contact())
+    assert response.status_code == 200
+
+    listed = client.get("/contact", headers=admin_headers).json()
+    assert [item["id"] for item in listed["items"]] == [response.json()["id"]]
+
+
+def test_search_contacts_ranks_and_pages(client, admin_headers):
+    client.post("/contact", json=contact(subject="Hello", message="Opening hours?"))
+    client.post("/contact", json=contact(message="Wedding catering, please"))
+    client.post("/contact", json=contact(message="Catering for a wedding party"))
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"q": "wedding catering", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/contact/search", params=params, headers=admin_headers)
+        assert page.status_code == 200
+        ids += [item["id"] for item in page.json()["items"]]
+        cursor = page.json()["next_cursor"]
+        if not cursor:
+            break
+
+    # Every match once, and not the contact that never mentions a wedding
+    assert sorted(ids) == [2, 3]
+
+
+def test_search_ignores_query_operators(client, admin_headers):
+    client.post("/contact", json=contact())
+    response = client.get(
+        "/contact/search", params={"q": '"wedding" OR *'}, headers=admin_headers
+    )
+    assert response.status_code == 200
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from database import SessionLocal
+from models import Booking
+from utils.events import encode_event_id, feed, hub
+
+
+def _booking(row_id: int, created_at: datetime) -> dict:
+    return {"id": row_id, "created_at": created_at}
+
+
+def test_live_events_are_delivered_in_commit_order():
+    async def scenario():
+        stream = feed(None)
+        first = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        now = datetime(2030, 1, 1, 12)
+        # Id 11 committed before id 10
+        hub.publish("bookings", _booking(11, now + timedelta(milliseconds=5)))
+        hub.publish("bookings", _booking(10, now))
+        events = [await first, await anext(stream)]
+        await stream.aclose()
+        return events
+
+    events = asyncio.run(scenario())
+    assert [data["id"] for _, _, data in events] == [11, 10]
+
+
+async def _resume_after_late_commit():
+    async with SessionLocal() as db:
+        early = Booking(
+            customer_name="Early",
+            customer_email="early@example.com",
+            customer_phone="0700000000",
+            booking_date=datetime(2030, 1, 4).date(),
+            booking_time="12:00",
+            party_size=2,
+        )
+        late = Booking(
+            customer_name="Late",
+            customer_email="late@example.com",
+            customer_phone="0700000000",
+            booking_date=datetime(2030, 1, 4).date(),
+            booking_time="12:00",
+            party_size=2,
+        )
+        db.add_all([early, late])
+        await db.commit()
+        # The client saw "Late" but not "Early", which committed after it
+        watermark = max(early.created_at, late.created_at)
+
+    stream = feed(encode_event_id(watermark))
+    events = [await anext(stream), await anext(stream)]
+    await stream.aclose()
+    return events
+
+
+def test_resume_replays_rows_committed_behind_the_watermark(client, run):
+    events = run(_resume_after_late_commit)
+    assert {data["customer_name"] for _, _, data in events} == {"Early", "Late"}
@@ -0,0 +1,8 @@
+def test_pool_stats_require_admin(client, admin_headers):
+    assert client.get("/health/pool").status_code == 422
+
+    customer = dict(admin_headers, **{"is-admin": "false"})
+    assert client.get("/health/pool", headers=customer).status_code == 403
+
+    response = client.get("/health/pool", headers=admin_headers)
+    assert response.status_code == 200
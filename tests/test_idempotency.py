@@ -0,0 +1,52 @@
+import pytest
+
+from utils import rate_limit
+
+CONTACT = {
+    "name": "Njoroge",
+    "email": "njoroge@example.com",
+    "subject": "Hours",
+    "message": "Are you open on Sunday?",
+}
+
+
+def test_retry_replays_the_stored_response(client):
+    headers = {"Idempotency-Key": "contact-1"}
+    first = client.post("/contact", json=CONTACT, headers=headers)
+    again = client.post("/contact", json=CONTACT, headers=headers)
+
+    assert again.status_code == 200
+    assert again.json() == first.json()
+    assert again.headers["idempotent-replayed"] == "true"
+
+
+def test_reused_key_with_another_body_is_rejected(client):
+    headers = {"Idempotency-Key": "contact-2"}
+    client.post("/contact", json=CONTACT, headers=headers)
+    other = client.post(
+        "/contact", json={**CONTACT, "subject": "Menu"}, headers=headers
+    )
+    assert other.status_code == 422
+
+
+@pytest.fixture
+def rate_limited(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    rate_limit.backend._buckets.clear()
+    yield
+    rate_limit.backend._buckets.clear()
+
+
+def test_rate_limited_attempt_is_not_replayed(client, rate_limited):
+    capacity, _ = rate_limit.parse_budget(rate_limit.RATE_LIMITS["contact"])
+    for i in range(int(capacity)):
+        client.post("/contact", json=CONTACT, headers={"Idempotency-Key": f"fill-{i}"})
+
+    headers = {"Idempotency-Key": "after-limit"}
+    assert client.post("/contact", json=CONTACT, headers=headers).status_code == 429
+
+    # Once the bucket refills, the same key runs the request for real
+    rate_limit.backend._buckets.clear()
+    retry = client.post("/contact", json=CONTACT, headers=headers)
+    assert retry.status_code == 200
+    assert "idempotent-replayed" not in retry.headers
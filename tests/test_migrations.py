@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from models import Base, include_object, is_search_object
+
+
+def test_autogenerate_leaves_the_search_index_alone():
+    engine = create_engine(
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "migrations.db")
+    )
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"include_object": include_object}
+        )
+        assert compare_metadata(context, Base.metadata) == []
+    engine.dispose()
+
+
+def test_postgres_search_objects_are_recognised():
+    assert is_search_object("column", "search_vector")
+    assert is_search_object("index", "ix_contacts_search_vector")
+    assert is_search_object("table", "reviews_fts_docsize")
+    assert not is_search_object("table", "reviews")
+    assert not is_search_object("index", "ix_reviews_created_at_id")
+
+
+def test_include_object_only_skips_reflected_search_objects():
+    assert not include_object(None, "contacts_fts", "table", True, None)
+    assert not include_object(None, "search_vector", "column", True, None)
+    assert include_object(None, "search_vector", "column", False, None)
+    assert include_object(None, "search_vector", "column", True, object())
+    assert include_object(None, "contacts", "table", True, None)
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from dependencies import db_now
+from models import EmailOutbox
+from utils import outbox_worker
+from utils.email_utils import queue_email
+
+
+async def _queue(status: str = "pending", next_attempt_at=None) -> int:
+    async with SessionLocal() as db:
+        message = queue_email(db, "guest@example.com", "Hello", "Body")
+        message.status = status
+        message.next_attempt_at = next_attempt_at or db_now()
+        await db.commit()
+        return message.id
+
+
+async def _load(message_id: int) -> EmailOutbox:
+    async with SessionLocal() as db:
+        return await db.get(EmailOutbox, message_id)
+
+
+def test_messages_are_sent_outside_the_claiming_transaction(client, run, monkeypatch):
+    message_id = run(_queue)
+    loop = client.portal.call(asyncio.get_running_loop)
+    seen = []
+
+    def deliver(to_email, subject, body):
+        # Another connection already sees the committed claim
+        row = asyncio.run_coroutine_threadsafe(_load(message_id), loop).result()
+        seen.append(row.status)
+
+    monkeypatch.setattr(outbox_worker, "deliver_email", deliver)
+    assert run(outbox_worker.drain_outbox) == 1
+    assert seen == ["sending"]
+    assert run(_load, message_id).status == "sent"
+
+
+def test_failed_send_is_retried_later(client, run, monkeypatch):
+    message_id = run(_queue)
+
+    def deliver(to_email, subject, body):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(outbox_worker, "deliver_email", deliver)
+    run(outbox_worker.drain_outbox)
+
+    message = run(_load, message_id)
+    assert message.status == "pending"
+    assert message.attempts == 1
+    assert message.last_error == "connection refused"
+    assert message.next_attempt_at > db_now()
+
+
+def test_expired_lease_is_claimed_again(client, run, smtp_sink):
+    # Left behind by a worker that died mid-batch
+    expired = run(_queue, "sending", db_now() - timedelta(seconds=1))
+    leased = run(_queue, "sending", db_now() + timedelta(seconds=60))
+
+    assert run(outbox_worker.drain_outbox) == 1
+    assert run(_load, expired).status == "sent"
+    assert run(_load, leased).status == "sending"
@@ -0,0 +1,36 @@
+def review(**overrides) -> dict:
+    return {
+        "customer_name": "Otieno",
+        "customer_email": "otieno@example.com",
+        "rating": 5,
+        "comment": "Best nyama choma in town",
+        "menu_id": 3,
+        **overrides,
+    }
+
+
+def test_reviews_update_the_menu_summary(client):
+    assert client.post("/reviews", json=review()).status_code == 200
+    assert client.post("/reviews", json=review(rating=2)).status_code == 200
+
+    summary = client.get("/reviews/summary/3").json()
+    assert summary["review_count"] == 2
+    assert summary["average_rating"] == 3.5
+
+
+def test_list_reviews_filters_by_rating(client, admin_headers):
+    client.post("/reviews", json=review())
+    client.post("/reviews", json=review(rating=1))
+
+    listed = client.get("/reviews", params={"rating": 1}, headers=admin_headers)
+    assert [item["rating"] for item in listed.json()["items"]] == [1]
+
+
+def test_search_reviews(client, admin_headers):
+    client.post("/reviews", json=review())
+    client.post("/reviews", json=review(comment="Slow service"))
+
+    found = client.get(
+        "/reviews/search", params={"q": "choma"}, headers=admin_headers
+    ).json()
+    assert [item["comment"] for item in found["items"]] == ["Best nyama choma in town"]
@@ -0,0 +1,78 @@
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.smtp_handshakes import _message, per_message
+from benchmarks.smtp_sink import SMTPSink
+from utils.smtp_pool import SMTPSessionPool
+
+
+@pytest.fixture
+def sink():
+    with SMTPSink() as sink:
+        yield sink
+
+
+def test_per_message_sending_handshakes_every_time(sink):
+    result = per_message(sink, 5)
+    assert sink.messages == 5
+    assert sink.connections == result["connections"] == 5
+
+
+def test_pool_reuses_one_session(sink):
+    pool = SMTPSessionPool(sink.host, sink.port, starttls=False)
+    for i in range(20):
+        pool.send_message(_message(i))
+    pool.close()
+
+    assert sink.messages == 20
+    assert sink.connections == pool.handshakes == 1
+
+
+def test_concurrent_senders_share_at_most_size_sessions(sink):
+    pool = SMTPSessionPool(sink.host, sink.port, starttls=False, size=2)
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda i: pool.send_message(_message(i)), range(40)))
+    pool.close()
+
+    assert sink.messages == 40
+    assert 1 <= pool.handshakes <= 2
+
+
+def test_sessions_idle_too_long_are_replaced(sink):
+    pool = SMTPSessionPool(sink.host, sink.port, starttls=False, max_idle=0)
+    pool.send_message(_message(0))
+    pool.send_message(_message(1))
+    pool.close()
+
+    assert sink.messages == 2
+    assert pool.handshakes == 2
+
+
+def test_rejected_recipient_keeps_the_session_and_the_batch(sink):
+    pool = SMTPSessionPool(sink.host, sink.port, starttls=False)
+    messages = [_message(i) for i in range(3)]
+    messages[1].replace_header("To", "reject-me@example.com")
+
+    failures = pool.send_messages(messages)
+    pool.send_message(_message(3))
+    pool.close()
+
+    assert list(failures) == [1]
+    assert isinstance(failures[1], smtplib.SMTPRecipientsRefused)
+    assert sink.messages == 3
+    assert pool.handshakes == 1
+
+
+def test_send_message_raises_the_rejection(sink):
+    pool = SMTPSessionPool(sink.host, sink.port, starttls=False)
+    message = _message(0)
+    message.replace_header("To", "reject-me@example.com")
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send_message(message)
+    pool.send_message(_message(1))
+    pool.close()
+
+    assert pool.handshakes == 1
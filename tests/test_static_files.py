@@ -0,0 +1,42 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils.build_static import build
+from utils.static_files import IMMUTABLE_CACHE_CONTROL, CachedStaticFiles
+
+
+@pytest.fixture
+def files(tmp_path):
+    (tmp_path / "menu.css").write_text("body { color: black; }\n" * 50)
+    # An upload that only looks content-hashed
+    (tmp_path / "menu.20240101.jpg").write_bytes(b"\xff\xd8 photo")
+    manifest = build(str(tmp_path))
+    manifest.pop("menu.20240101.jpg")
+
+    app = FastAPI()
+    app.mount("/Files", CachedStaticFiles(directory=tmp_path), name="Files")
+    with TestClient(app) as client:
+        yield client, manifest
+
+
+def test_manifest_copies_are_immutable(files):
+    client, manifest = files
+    response = client.get(f"/Files/{manifest['menu.css']}")
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_names_that_merely_look_hashed_are_not(files):
+    client, _ = files
+    for name in ("menu.css", "menu.20240101.jpg"):
+        response = client.get(f"/Files/{name}")
+        assert response.status_code == 200
+        assert "immutable" not in response.headers["cache-control"]
+
+
+def test_precompressed_variant_is_served(files):
+    client, manifest = files
+    response = client.get(
+        f"/Files/{manifest['menu.css']}", headers={"Accept-Encoding": "br"}
+    )
+    assert response.headers["content-encoding"] == "br"
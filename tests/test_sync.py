@@ -0,0 +1,38 @@
+from sqlalchemy import text
+
+from database import SessionLocal
+
+
+async def _insert_legacy_contact():
+    # As written before updated_at existed: the column is left to the database
+    async with SessionLocal() as db:
+        await db.execute(
+            text(
+                "INSERT INTO contacts (name, email, subject, message, created_at) "
+                "VALUES ('Old', 'old@example.com', 'Hi', 'Legacy row', "
+                "'2024-01-01 10:00:00')"
+            )
+        )
+        await db.commit()
+
+
+def test_rows_without_updated_at_still_sync(client, run, admin_headers):
+    run(_insert_legacy_contact)
+
+    changes = client.get("/sync", headers=admin_headers).json()
+    assert [contact["name"] for contact in changes["contacts"]] == ["Old"]
+
+
+def test_sync_returns_only_newer_changes(client, admin_headers):
+    client.post(
+        "/contact",
+        json={
+            "name": "First",
+            "email": "first@example.com",
+            "subject": "Hi",
+            "message": "One",
+        },
+    )
+    first = client.get("/sync", headers=admin_headers).json()
+    assert [contact["name"] for contact in first["contacts"]] == ["First"]
+    assert first["has_more"] is False
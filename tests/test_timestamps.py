@@ -0,0 +1,84 @@
+"""Every timestamp column is without time zone, so binds must be naive.
+
+psycopg2 converted aware datetimes to the session zone, asyncpg rejects
+them and SQLite drops the offset, so check the parameters on every driver.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from database import async_database_url, connect_args, engine
+from dependencies import db_now
+from utils.outbox_worker import drain_outbox
+
+
+def test_db_now_is_naive_utc_by_default():
+    now = db_now()
+    assert now.tzinfo is None
+    utc = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs(now - utc) < timedelta(seconds=5)
+
+
+def test_asyncpg_sessions_use_the_column_zone():
+    url = async_database_url("postgresql://app@db/ypa")
+    assert connect_args(url) == {"server_settings": {"timezone": "UTC"}}
+
+
+def _datetimes(parameters):
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    for value in parameters:
+        if isinstance(value, (list, tuple, dict)):
+            yield from _datetimes(value)
+        elif isinstance(value, datetime):
+            yield value
+
+
+def test_writes_bind_naive_datetimes(client, run):
+    bound = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        # Before the driver's bind processing, which turns them into strings
+        # on SQLite
+        bound.extend(_datetimes(context.compiled_parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", collect)
+    try:
+        client.post(
+            "/bookings",
+            headers={"Idempotency-Key": "timestamps-booking"},
+            json={
+                "customer_name": "Kamau",
+                "customer_email": "kamau@example.com",
+                "customer_phone": "0722000000",
+                "booking_date": "2030-01-04",
+                "booking_time": "13:00",
+                "party_size": 2,
+            },
+        )
+        client.post(
+            "/contact",
+            json={
+                "name": "Kamau",
+                "email": "kamau@example.com",
+                "subject": "Parking",
+                "message": "Is there parking?",
+            },
+        )
+        client.post(
+            "/reviews",
+            json={
+                "customer_name": "Kamau",
+                "customer_email": "kamau@example.com",
+                "rating": 4,
+                "comment": "Good",
+                "menu_id": 1,
+            },
+        )
+        run(drain_outbox)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", collect)
+
+    assert bound
+    assert [value for value in bound if value.tzinfo is not None] == []
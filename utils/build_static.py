@@ -0,0 +1,106 @@
+"""Write content-hashed copies and precompressed variants of the static files.
+
+    python -m utils.build_static [directory]
+
+For every file in ``directory`` (``Files/`` by default) this writes a copy
+named ``<name>.<hash>.<ext>``, ``.gz`` and ``.br`` siblings for compressible
+types, and a ``manifest.json`` mapping each original name to its hashed
+name. Running it again only rewrites what changed.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+from mimetypes import guess_type
+
+import brotli
+
+from utils.static_files import MANIFEST_NAME, is_hashed_name
+
+COMPRESSED_SUFFIXES = (".br", ".gz")
+COMPRESSIBLE_TYPES = (
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def is_compressible(path: str) -> bool:
+    media_type = guess_type(path)[0] or ""
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def _write_if_smaller(path: str, data: bytes, original_size: int):
+    if len(data) >= original_size:
+        return
+    with open(path + ".tmp", "wb") as file:
+        file.write(data)
+    os.replace(path + ".tmp", path)
+
+
+def _is_fresh(variant: str, source: str) -> bool:
+    if not os.path.exists(variant):
+        return False
+    return os.path.getmtime(variant) >= os.path.getmtime(source)
+
+
+def compress_file(path: str):
+    """Write ``.gz``/``.br`` siblings for ``path`` when they save space."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if not _is_fresh(path + ".gz", path):
+        _write_if_smaller(
+            path + ".gz", gzip.compress(data, compresslevel=9, mtime=0), len(data)
+        )
+    if not _is_fresh(path + ".br", path):
+        _write_if_smaller(path + ".br", brotli.compress(data, quality=11), len(data))
+
+
+def build(directory: str) -> dict[str, str]:
+    manifest = {}
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if (
+                name == MANIFEST_NAME
+                or name.endswith(COMPRESSED_SUFFIXES)
+                or is_hashed_name(name)
+            ):
+                continue
+
+            stem, ext = os.path.splitext(name)
+            hashed_name = f"{stem}.{_file_hash(path)}{ext}"
+            hashed_path = os.path.join(root, hashed_name)
+            if not os.path.exists(hashed_path):
+                shutil.copy2(path, hashed_path)
+
+            if is_compressible(name):
+                for target in (path, hashed_path):
+                    compress_file(target)
+
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            manifest[relative] = os.path.relpath(hashed_path, directory).replace(
+                os.sep, "/"
+            )
+
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    return manifest
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else "Files"
+    manifest = build(directory)
+    print(f"Wrote {len(manifest)} entries to {os.path.join(directory, MANIFEST_NAME)}")
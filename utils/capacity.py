@@ -0,0 +1,125 @@
+"""Booking slot capacity.
+
+Rebuild slot occupancy from the bookings table with:
+
+    python -m utils.capacity
+"""
+
+import asyncio
+import os
+from datetime import date
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import SessionLocal, upsert
+from models import Booking, SlotCapacity, SlotOccupancy
+from routers.schemas import SlotAvailability
+
+load_dotenv()
+
+# Slots offered every day unless a weekday overrides them in slot_capacities
+BOOKING_SLOTS = [
+    slot.strip()
+    for slot in os.getenv(
+        "BOOKING_SLOTS", "12:00,13:00,14:00,18:00,19:00,20:00,21:00"
+    ).split(",")
+    if slot.strip()
+]
+DEFAULT_SLOT_SEATS = int(os.getenv("DEFAULT_SLOT_SEATS", "40"))
+
+
+async def slot_capacities(db: AsyncSession, day: date) -> dict[str, int]:
+    """Seats per booking time on ``day``, with weekday overrides applied."""
+    capacities = {slot: DEFAULT_SLOT_SEATS for slot in BOOKING_SLOTS}
+    result = await db.execute(
+        select(SlotCapacity.booking_time, SlotCapacity.seats).where(
+            SlotCapacity.weekday == day.weekday()
+        )
+    )
+    capacities.update(result.tuples().all())
+    return capacities
+
+
+async def availability(db: AsyncSession, day: date) -> list[SlotAvailability]:
+    capacities = await slot_capacities(db, day)
+    result = await db.execute(
+        select(SlotOccupancy.booking_time, SlotOccupancy.seats_booked).where(
+            SlotOccupancy.booking_date == day
+        )
+    )
+    booked = dict(result.tuples().all())
+    return [
+        SlotAvailability(
+            booking_time=slot,
+            capacity=seats,
+            booked=booked.get(slot, 0),
+            available=max(seats - booked.get(slot, 0), 0),
+        )
+        for slot, seats in sorted(capacities.items())
+    ]
+
+
+async def reserve_seats(
+    db: AsyncSession, day: date, booking_time: str, party_size: int
+):
+    """Take ``party_size`` seats from a slot in the caller's transaction.
+
+    The conditional UPDATE locks the slot's occupancy row until the caller
+    commits, so concurrent bookings for the same slot cannot overbook it.
+    Times that are not a slot on that day are rejected with 422.
+    """
+    capacities = await slot_capacities(db, day)
+    capacity = capacities.get(booking_time)
+    if capacity is None:
+        times = ", ".join(sorted(capacities))
+        raise HTTPException(
+            status_code=422, detail=f"Bookings on {day} can be made for {times}"
+        )
+
+    await db.execute(
+        upsert(db, SlotOccupancy)
+        .values(booking_date=day, booking_time=booking_time, seats_booked=0)
+        .on_conflict_do_nothing()
+    )
+    result = await db.execute(
+        update(SlotOccupancy)
+        .where(
+            SlotOccupancy.booking_date == day,
+            SlotOccupancy.booking_time == booking_time,
+            SlotOccupancy.seats_booked + party_size <= capacity,
+        )
+        .values(seats_booked=SlotOccupancy.seats_booked + party_size)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=409, detail="Not enough seats left for this time slot"
+        )
+
+
+async def rebuild_occupancy(db: AsyncSession) -> int:
+    """Recompute every slot's booked seats from the bookings table."""
+    totals = select(
+        Booking.booking_date, Booking.booking_time, func.sum(Booking.party_size)
+    ).group_by(Booking.booking_date, Booking.booking_time)
+
+    await db.execute(delete(SlotOccupancy))
+    result = await db.execute(
+        insert(SlotOccupancy).from_select(
+            ["booking_date", "booking_time", "seats_booked"], totals
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def main():
+    async with SessionLocal() as db:
+        slots = await rebuild_occupancy(db)
+    print(f"Rebuilt occupancy for {slots} booking slots")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+import os
+import zlib
+
+import brotli
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.static_files import accepted_encodings
+
+load_dotenv()
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Media that is already compressed, or must reach the client unbuffered
+SKIPPED_MEDIA_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+SKIPPED_MEDIA_TYPES = (
+    "application/gzip",
+    "application/zip",
+    "application/pdf",
+    "text/event-stream",
+)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _is_skipped_media(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith(SKIPPED_MEDIA_PREFIXES) or (
+        media_type in SKIPPED_MEDIA_TYPES
+    )
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, as negotiated via Accept-Encoding.
+
+    Single-body responses smaller than ``minimum_size`` are sent as they are,
+    as are responses that already carry a Content-Encoding, already-compressed
+    media and anything under ``excluded_paths``. Streaming bodies are
+    compressed chunk by chunk, so they are never buffered in full.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        excluded_paths: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_paths = excluded_paths
+
+    def _encoder(self, scope: Scope):
+        accepted = accepted_encodings(Headers(scope=scope))
+        if "br" in accepted:
+            return "br", _BrotliEncoder(self.brotli_quality)
+        if "gzip" in accepted:
+            return "gzip", _GzipEncoder(self.gzip_level)
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_paths):
+            return await self.app(scope, receive, send)
+
+        encoding, encoder = self._encoder(scope)
+        if encoder is None:
+            return await self.app(scope, receive, send)
+
+        start_message: Message | None = None
+        compressing = False
+
+        async def compressing_send(message: Message):
+            nonlocal start_message, compressing
+
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk decides
+                start_message = message
+                return
+
+            if start_message is None:
+                return await send(message)
+
+            if message["type"] != "http.response.body":
+                # pathsend and friends: the server sends the file as it is
+                await send(start_message)
+                start_message = None
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if (
+                "content-encoding" in headers
+                or _is_skipped_media(headers.get("content-type", ""))
+                or start_message["status"] in (204, 304)
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                await send(start_message)
+                start_message = None
+                return await send(message)
+
+            compressing = True
+            compressed = encoder.process(body)
+            if not more_body:
+                compressed += encoder.finish()
+                headers["content-length"] = str(len(compressed))
+            else:
+                del headers["content-length"]
+            headers["content-encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            # The compressed bytes differ from the original representation
+            if "etag" in headers and not headers["etag"].startswith("W/"):
+                headers["etag"] = "W/" + headers["etag"]
+
+            await send(start_message)
+            start_message = None
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
+
+        async def compressing_body(message: Message):
+            if message["type"] != "http.response.body":
+                return await send(message)
+            body = encoder.process(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            if not more_body:
+                body += encoder.finish()
+            elif not body:
+                return
+            await send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+
+        async def dispatch(message: Message):
+            if compressing:
+                return await compressing_body(message)
+            return await compressing_send(message)
+
+        await self.app(scope, receive, dispatch)
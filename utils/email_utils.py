@@ -1,21 +1,25 @@
 import os
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import EmailOutbox
+from utils.smtp_pool import FROM_EMAIL, smtp_pool
 
 load_dotenv()
 
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
-SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "admin@ypambuzi.com")
-FROM_EMAIL = os.getenv("FROM_EMAIL", SMTP_USERNAME)
+# Admin notifications are held and sent as one digest per window; 0 sends
+# each one straight away
+ADMIN_DIGEST_WINDOW = float(os.getenv("ADMIN_DIGEST_WINDOW", "300"))
+ADMIN_DIGEST_MAX_ITEMS = int(os.getenv("ADMIN_DIGEST_MAX_ITEMS", "50"))
+# Bookings at least this large are announced to the admin immediately
+ADMIN_URGENT_PARTY_SIZE = int(os.getenv("ADMIN_URGENT_PARTY_SIZE", "10"))
 
 
-def send_email(to_email: str, subject: str, body: str):
-    """Send an email via configured SMTP server."""
+def deliver_email(to_email: str, subject: str, body: str):
+    """Send an email via configured SMTP server, raising on failure."""
     msg = MIMEMultipart()
     msg["From"] = FROM_EMAIL
     msg["To"] = to_email
@@ -23,13 +27,38 @@ def send_email(to_email: str, subject: str, body: str):
 
     msg.attach(MIMEText(body, "plain"))
 
-    try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            print("ADMIN_EMAIL:", os.getenv("ADMIN_EMAIL"))
-            print("FROM_EMAIL:", os.getenv("FROM_EMAIL"))
+    smtp_pool.send_message(msg)
 
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.sendmail(FROM_EMAIL, to_email, msg.as_string())
+
+def send_email(to_email: str, subject: str, body: str):
+    """Send an email via configured SMTP server."""
+    try:
+        deliver_email(to_email, subject, body)
     except Exception as e:
         print(f"❌ Error sending email to {to_email}: {e}")
+
+
+def queue_email(db: AsyncSession, to_email: str, subject: str, body: str) -> EmailOutbox:
+    """Add an email to the outbox as part of the caller's transaction.
+
+    Nothing is sent here; the outbox worker delivers the message once the
+    caller commits.
+    """
+    message = EmailOutbox(to_email=to_email, subject=subject, body=body)
+    db.add(message)
+    return message
+
+
+def queue_admin_notification(
+    db: AsyncSession, subject: str, body: str, urgent: bool = False
+) -> EmailOutbox:
+    """Queue a notification for ADMIN_EMAIL, to go out in the next digest.
+
+    The outbox worker gathers held notifications into one email once the
+    oldest has waited ADMIN_DIGEST_WINDOW seconds or ADMIN_DIGEST_MAX_ITEMS
+    have piled up. ``urgent`` ones skip the digest and are sent on their own.
+    """
+    message = queue_email(db, ADMIN_EMAIL, subject, body)
+    if not urgent and ADMIN_DIGEST_WINDOW > 0:
+        message.status = "held"
+    return message
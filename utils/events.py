@@ -0,0 +1,174 @@
+"""In-process pub/sub of new bookings, contacts and reviews for the admin feed.
+
+The POST handlers publish each new row after committing it, and every
+subscriber gets it through its own bounded queue. A subscriber that falls
+EVENT_QUEUE_SIZE events behind is disconnected rather than allowed to grow
+without limit; it reconnects with its last event id and catches up from the
+database, which also covers rows written by other workers.
+
+Ids are assigned at INSERT but rows are published at commit, so neither
+order can be trusted to skip what a client has seen. Event ids are instead
+a watermark, the newest ``created_at`` sent so far, and a resume re-reads
+everything from EVENT_OVERLAP seconds before it. A client may therefore see
+a row twice and should de-duplicate on the resource and ``id``, as /sync
+clients do.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import AsyncIterator
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+
+from database import SessionLocal
+from dependencies import db_now
+from models import Booking, Contact, Review
+
+load_dotenv()
+
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+EVENT_HEARTBEAT = float(os.getenv("EVENT_HEARTBEAT", "15"))
+# Past this many missed rows a client is told to reload its lists instead
+EVENT_CATCHUP_LIMIT = int(os.getenv("EVENT_CATCHUP_LIMIT", "500"))
+# How far before the watermark a resume starts, for rows committed late
+EVENT_OVERLAP = float(os.getenv("EVENT_OVERLAP", "5"))
+
+# The compact fields sent for each new row
+FEED_COLUMNS = {
+    "bookings": (
+        Booking,
+        (
+            "id",
+            "customer_name",
+            "booking_date",
+            "booking_time",
+            "party_size",
+            "created_at",
+        ),
+    ),
+    "contacts": (Contact, ("id", "name", "subject", "created_at")),
+    "reviews": (Review, ("id", "customer_name", "rating", "menu_id", "created_at")),
+}
+
+
+class Subscription:
+    def __init__(self, maxsize: int):
+        # None in the queue means "overflowed, disconnect"
+        self.queue: asyncio.Queue[tuple[str, dict] | None] = asyncio.Queue(maxsize)
+
+
+class EventHub:
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions: set[Subscription] = set()
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, resource: str, data: dict):
+        for subscription in list(self._subscriptions):
+            try:
+                subscription.queue.put_nowait((resource, data))
+            except asyncio.QueueFull:
+                # Make room for the disconnect marker; the client catches up
+                # from the database when it reconnects
+                self.unsubscribe(subscription)
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(None)
+
+
+hub = EventHub()
+
+
+def publish_row(resource: str, row):
+    """Publish a committed row to the admin feed."""
+    _, columns = FEED_COLUMNS[resource]
+    hub.publish(resource, {column: getattr(row, column) for column in columns})
+
+
+def encode_event_id(watermark: datetime) -> str:
+    return watermark.isoformat()
+
+
+def decode_event_id(event_id: str | None) -> datetime | None:
+    if not event_id:
+        return None
+    try:
+        return datetime.fromisoformat(event_id)
+    except ValueError:
+        return None
+
+
+async def _missed_rows(watermark: datetime) -> list[tuple[str, dict]] | None:
+    """Rows created since ``watermark`` less the overlap, or None when too many."""
+    since = watermark - timedelta(seconds=EVENT_OVERLAP)
+    missed = []
+    async with SessionLocal() as db:
+        for resource, (model, columns) in FEED_COLUMNS.items():
+            result = await db.execute(
+                select(*[getattr(model, column) for column in columns])
+                .where(model.created_at > since)
+                .order_by(model.created_at, model.id)
+                .limit(EVENT_CATCHUP_LIMIT + 1)
+            )
+            rows = result.mappings().all()
+            if len(missed) + len(rows) > EVENT_CATCHUP_LIMIT:
+                return None
+            missed.extend((resource, dict(row)) for row in rows)
+    missed.sort(key=lambda event: event[1]["created_at"])
+    return missed
+
+
+async def feed(last_event_id: str | None) -> AsyncIterator[tuple[str, str, dict]]:
+    """Yield ``(event_id, event, data)`` for the admin feed, forever.
+
+    With ``last_event_id`` the rows created since are sent first. A
+    ``("", "heartbeat", {})`` is yielded when nothing happened for
+    EVENT_HEARTBEAT seconds, and a ``"reset"`` event when the client missed
+    too much to catch up and should reload its lists. The iterator ends when
+    the subscriber overflows.
+    """
+    subscription = hub.subscribe()
+    try:
+        watermark = decode_event_id(last_event_id)
+        # Rows sent during catch-up that may also be waiting in the queue
+        caught_up: set[tuple[str, int]] = set()
+        if watermark is None:
+            watermark = db_now()
+        else:
+            missed = await _missed_rows(watermark)
+            if missed is None:
+                watermark = db_now()
+                yield encode_event_id(watermark), "reset", {}
+            else:
+                for resource, data in missed:
+                    caught_up.add((resource, data["id"]))
+                    watermark = max(watermark, data["created_at"])
+                    yield encode_event_id(watermark), resource, data
+
+        while True:
+            try:
+                item = await asyncio.wait_for(subscription.queue.get(), EVENT_HEARTBEAT)
+            except asyncio.TimeoutError:
+                # The queue is drained, so no catch-up row can still be in it
+                caught_up.clear()
+                yield "", "heartbeat", {}
+                continue
+            if item is None:
+                return
+            resource, data = item
+            if (resource, data["id"]) in caught_up:
+                caught_up.discard((resource, data["id"]))
+                continue
+            watermark = max(watermark, data["created_at"])
+            yield encode_event_id(watermark), resource, data
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Literal
+
+from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from database import SessionLocal
+
+load_dotenv()
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_statement(model, columns: list[str]) -> Select:
+    """Select only the exported columns, in primary key order."""
+    return select(*[getattr(model, column) for column in columns]).order_by(model.id)
+
+
+def created_between(model, date_from: date | None, date_to: date | None) -> list:
+    """Conditions for rows created between two dates, inclusive."""
+    conditions = []
+    if date_from:
+        conditions.append(model.created_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        conditions.append(
+            model.created_at < datetime.combine(date_to + timedelta(days=1), time.min)
+        )
+    return conditions
+
+
+def filter_created_at(
+    statement: Select, model, date_from: date | None, date_to: date | None
+) -> Select:
+    """Limit ``statement`` to rows created between two dates, inclusive."""
+    return statement.where(*created_between(model, date_from, date_to))
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_line(values) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+async def _stream_rows(statement: Select, columns: list[str], fmt: ExportFormat):
+    # The request's own session is closed before a streaming body is sent,
+    # so the export owns its session for as long as the client is reading.
+    async with SessionLocal() as db:
+        result = await db.stream(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        if fmt == "csv":
+            yield _csv_line(columns)
+        async for row in result:
+            if fmt == "csv":
+                yield _csv_line(row)
+            else:
+                yield json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+
+
+def export_response(
+    statement: Select, columns: list[str], name: str, fmt: ExportFormat
+) -> StreamingResponse:
+    """Stream ``statement`` as NDJSON or CSV over a server-side cursor."""
+    return StreamingResponse(
+        _stream_rows(statement, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
@@ -0,0 +1,106 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from dotenv import load_dotenv
+from fastapi import Request, Response
+
+load_dotenv()
+
+# How long a serialized list may be reused when another worker could have
+# written since; local writes invalidate it straight away
+LIST_CACHE_TTL = float(os.getenv("LIST_CACHE_TTL", "2"))
+LIST_CACHE_SIZE = int(os.getenv("LIST_CACHE_SIZE", "256"))
+
+
+class ResourceVersions:
+    """Per-resource counters bumped by every local write."""
+
+    def __init__(self):
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, resource: str) -> int:
+        return self._versions.get(resource, 0)
+
+    def bump(self, resource: str):
+        with self._lock:
+            self._versions[resource] = self._versions.get(resource, 0) + 1
+
+
+class ResponseCache:
+    """Short-lived LRU of serialized list bodies and their ETags."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, int, str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, version: int) -> tuple[str, bytes] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, stored_version, etag, body = entry
+            if stored_version != version or time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return etag, body
+
+    def put(self, key: tuple, version: int, etag: str, body: bytes):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), version, etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+resource_versions = ResourceVersions()
+response_cache = ResponseCache(LIST_CACHE_SIZE, LIST_CACHE_TTL)
+
+
+def mark_changed(resource: str):
+    """Invalidate cached lists of ``resource``; call after committing a write."""
+    resource_versions.bump(resource)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison: compression middleware marks
+    # the ETag of an encoded body as W/ and clients echo it back that way
+    candidates = [
+        candidate.strip().removeprefix("W/") for candidate in header.split(",")
+    ]
+    return "*" in candidates or etag in candidates
+
+
+async def cached_json_response(
+    request: Request, resource: str, build: Callable[[], Awaitable[bytes]]
+) -> Response:
+    """Serve a JSON list with a strong ETag, answering 304 when it still matches.
+
+    ``build`` runs the query and serializes it; it is skipped while a cached
+    body for the same query string is fresh.
+    """
+    key = (resource, tuple(sorted(request.query_params.multi_items())))
+    version = resource_versions.get(resource)
+
+    cached = response_cache.get(key, version)
+    if cached is None:
+        body = await build()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        response_cache.put(key, version, etag, body)
+    else:
+        etag, body = cached
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
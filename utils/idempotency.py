@@ -0,0 +1,358 @@
+"""Idempotency-Key support for the public POST endpoints.
+
+A POST carrying an ``Idempotency-Key`` header runs once per key; repeats get
+the stored response back, marked with ``Idempotent-Replayed: true``, without
+reaching the handler. A repeat that arrives while the first request is still
+running waits for it. Reusing a key with a different body is rejected.
+
+IDEMPOTENCY_STORE picks where keys live: ``memory`` (default) for a single
+worker, ``database`` when several workers serve the same clients. Purge
+expired database keys with:
+
+    python -m utils.idempotency
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from database import SessionLocal
+from dependencies import db_now
+from models import IdempotencyKey
+
+load_dotenv()
+
+IDEMPOTENCY_STORE = os.getenv("IDEMPOTENCY_STORE", "memory")
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+# How long a duplicate waits for the first request, and how long a database
+# key may stay in progress before another worker may take it over
+IDEMPOTENCY_LOCK_TIMEOUT = float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", "30"))
+IDEMPOTENCY_POLL_INTERVAL = float(os.getenv("IDEMPOTENCY_POLL_INTERVAL", "0.05"))
+
+MAX_KEY_LENGTH = 255
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+class IdempotencyError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _mismatch() -> IdempotencyError:
+    return IdempotencyError(
+        422, "Idempotency-Key was already used with a different request"
+    )
+
+
+def _still_running() -> IdempotencyError:
+    return IdempotencyError(
+        409, "A request with this Idempotency-Key is still being processed"
+    )
+
+
+class MemoryIdempotencyStore:
+    """LRU of completed responses, plus the keys currently in flight."""
+
+    def __init__(self, maxsize: int, ttl: float, wait_timeout: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._entries: OrderedDict[str, tuple[float, str, StoredResponse]] = (
+            OrderedDict()
+        )
+        self._in_flight: dict[str, tuple[str, asyncio.Event]] = {}
+
+    def _completed(self, key: str) -> tuple[str, StoredResponse] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, request_hash, response = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return request_hash, response
+
+    async def begin(self, key: str, request_hash: str) -> StoredResponse | None:
+        """Return the stored response for ``key``, or None once the caller owns it."""
+        while True:
+            completed = self._completed(key)
+            if completed is not None:
+                if completed[0] != request_hash:
+                    raise _mismatch()
+                return completed[1]
+
+            flight = self._in_flight.get(key)
+            if flight is None:
+                self._in_flight[key] = (request_hash, asyncio.Event())
+                return None
+            if flight[0] != request_hash:
+                raise _mismatch()
+            try:
+                await asyncio.wait_for(flight[1].wait(), self.wait_timeout)
+            except asyncio.TimeoutError:
+                raise _still_running()
+
+    async def complete(self, key: str, request_hash: str, response: StoredResponse):
+        self._entries[key] = (time.monotonic() + self.ttl, request_hash, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        await self.release(key)
+
+    async def release(self, key: str):
+        flight = self._in_flight.pop(key, None)
+        if flight is not None:
+            flight[1].set()
+
+
+class DatabaseIdempotencyStore:
+    """Keys in the idempotency_keys table, shared by every worker.
+
+    The primary key makes claiming atomic: of two workers inserting the same
+    key, one gets an IntegrityError and polls until the other completes.
+    """
+
+    def __init__(self, ttl: float, lock_timeout: float, poll_interval: float):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+
+    async def begin(self, key: str, request_hash: str) -> StoredResponse | None:
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            async with SessionLocal() as db:
+                await db.execute(
+                    delete(IdempotencyKey).where(
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.expires_at <= db_now(),
+                    )
+                )
+                row = (
+                    await db.execute(
+                        select(IdempotencyKey).where(IdempotencyKey.key == key)
+                    )
+                ).scalar_one_or_none()
+
+                if row is None:
+                    db.add(
+                        IdempotencyKey(
+                            key=key,
+                            request_hash=request_hash,
+                            expires_at=db_now()
+                            + timedelta(seconds=self.lock_timeout),
+                        )
+                    )
+                    try:
+                        await db.commit()
+                        return None
+                    except IntegrityError:
+                        # Another worker claimed it first; look again
+                        await db.rollback()
+                        continue
+
+                await db.commit()
+                if row.request_hash != request_hash:
+                    raise _mismatch()
+                if row.status == "completed":
+                    return StoredResponse(
+                        status=row.response_status,
+                        headers=[
+                            (name.encode("latin-1"), value.encode("latin-1"))
+                            for name, value in json.loads(row.response_headers)
+                        ],
+                        body=row.response_body,
+                    )
+
+            if time.monotonic() >= deadline:
+                raise _still_running()
+            await asyncio.sleep(self.poll_interval)
+
+    async def complete(self, key: str, request_hash: str, response: StoredResponse):
+        async with SessionLocal() as db:
+            row = await db.get(IdempotencyKey, key)
+            if row is None:
+                return
+            row.status = "completed"
+            row.response_status = response.status
+            row.response_headers = json.dumps(
+                [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in response.headers
+                ]
+            )
+            row.response_body = response.body
+            row.expires_at = db_now() + timedelta(seconds=self.ttl)
+            await db.commit()
+
+    async def release(self, key: str):
+        async with SessionLocal() as db:
+            await db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.status == "in_progress"
+                )
+            )
+            await db.commit()
+
+
+def create_store():
+    if IDEMPOTENCY_STORE == "database":
+        return DatabaseIdempotencyStore(
+            IDEMPOTENCY_TTL, IDEMPOTENCY_LOCK_TIMEOUT, IDEMPOTENCY_POLL_INTERVAL
+        )
+    return MemoryIdempotencyStore(
+        IDEMPOTENCY_CACHE_SIZE, IDEMPOTENCY_TTL, IDEMPOTENCY_LOCK_TIMEOUT
+    )
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+# Rejections made before the handler runs: rate limiting and request
+# validation. The retry should be judged afresh, not replayed.
+UNSTORED_STATUSES = {422, 429}
+
+
+class IdempotencyMiddleware:
+    """Honour Idempotency-Key on POSTs to ``paths``.
+
+    Handler responses below 500 are stored. After a server error, an
+    exception or one of UNSTORED_STATUSES the key is released so the
+    client's retry runs again.
+    """
+
+    def __init__(self, app: ASGIApp, paths: tuple[str, ...], store=None):
+        self.app = app
+        self.paths = {path.rstrip("/") for path in paths}
+        self.store = store or create_store()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"].rstrip("/") not in self.paths
+        ):
+            return await self.app(scope, receive, send)
+
+        key = Headers(scope=scope).get("idempotency-key")
+        if key is None:
+            return await self.app(scope, receive, send)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"},
+                status_code=400,
+            )
+            return await response(scope, receive, send)
+
+        body = await _read_body(receive)
+        request_hash = hashlib.sha256(body).hexdigest()
+        store_key = f"{scope['path'].rstrip('/')}:{key}"
+
+        try:
+            stored = await self.store.begin(store_key, request_hash)
+        except IdempotencyError as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code)
+            return await response(scope, receive, send)
+
+        if stored is not None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": stored.status,
+                    "headers": stored.headers + [(b"idempotent-replayed", b"true")],
+                }
+            )
+            await send({"type": "http.response.body", "body": stored.body})
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = None
+        headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+        finished = False
+
+        async def capture_send(message: Message):
+            nonlocal status, headers, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                finished = not message.get("more_body", False)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await self.store.release(store_key)
+            raise
+
+        if (
+            finished
+            and status is not None
+            and status < 500
+            and status not in UNSTORED_STATUSES
+        ):
+            await self.store.complete(
+                store_key,
+                request_hash,
+                StoredResponse(status, headers, b"".join(chunks)),
+            )
+        else:
+            await self.store.release(store_key)
+
+
+async def purge_expired() -> int:
+    async with SessionLocal() as db:
+        result = await db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= db_now())
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def main():
+    purged = await purge_expired()
+    print(f"Purged {purged} expired idempotency keys")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,222 @@
+"""In-process metrics, exposed in the Prometheus text format at /metrics.
+
+Every series is updated from the event loop thread only: requests by
+MetricsMiddleware, queries by the engine events (the async engine runs them
+on the loop), and SMTP and bcrypt timings by the coroutines awaiting them.
+That is what lets the hot path skip locks. Bucket arrays are allocated once
+per label set, so observing a value is a bisect and two additions.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5)
+LATENCY_BUCKETS += (1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for labels, value in list(self._values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} "
+                f"{_format_number(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple = LATENCY_BUCKETS,
+        labelnames: tuple = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = labelnames
+        # Per label set: one count per bucket, one for +Inf, then the sum
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, labels: tuple = ()):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bounds = [_format_number(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                label_text = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_number(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+http_requests = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status class.",
+    ("method", "route", "status"),
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last body chunk.",
+    labelnames=("method", "route"),
+)
+http_request_queries = Histogram(
+    "http_request_db_queries",
+    "Database queries issued while handling one request.",
+    buckets=QUERY_COUNT_BUCKETS,
+    labelnames=("method", "route"),
+)
+http_request_db_time = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database queries while handling one request.",
+    labelnames=("method", "route"),
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Duration of every database query, in or out of a request.",
+)
+smtp_send_duration = Histogram(
+    "smtp_send_duration_seconds",
+    "Time to hand one outbox email to the SMTP server.",
+    labelnames=("outcome",),
+)
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds",
+    "Time to hash or verify a password, including time queued for a worker.",
+    labelnames=("operation",),
+)
+
+REGISTRY = (
+    http_requests,
+    http_request_duration,
+    http_request_queries,
+    http_request_db_time,
+    db_query_duration,
+    smtp_send_duration,
+    password_hash_duration,
+)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# [query count, query seconds] for the request being handled, if any
+_request_queries: ContextVar[list | None] = ContextVar("request_queries", default=None)
+
+
+def instrument_engine(engine):
+    """Time every query run through ``engine`` (sync or async)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        db_query_duration.observe(elapsed)
+        usage = _request_queries.get()
+        if usage is not None:
+            usage[0] += 1
+            usage[1] += elapsed
+
+
+def route_label(scope: Scope) -> str:
+    """The route template that handled ``scope``, once routing has run."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Mounted apps such as /Files set no route, only their endpoint
+    if "endpoint" in scope:
+        return scope.get("root_path") or "unmatched"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Record count, status class, latency and query usage per route template.
+
+    Routes are labelled by their template (``/reviews/summary/{menu_id}``)
+    so that path parameters cannot blow up the number of series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = 500
+        usage = [0, 0.0]
+        token = _request_queries.set(usage)
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
+            labels = (scope["method"], route_label(scope))
+            http_requests.inc(labels + (f"{status // 100}xx",))
+            http_request_duration.observe(time.perf_counter() - started, labels)
+            http_request_queries.observe(usage[0], labels)
+            http_request_db_time.observe(usage[1], labels)
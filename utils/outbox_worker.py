@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import timedelta
+
+from dotenv import load_dotenv
+from sqlalchemy import func, select, update
+
+from database import SessionLocal
+from dependencies import db_now
+from models import EmailOutbox
+from utils.email_utils import (
+    ADMIN_DIGEST_MAX_ITEMS,
+    ADMIN_DIGEST_WINDOW,
+    ADMIN_EMAIL,
+    deliver_email,
+    queue_email,
+)
+from utils.metrics import smtp_send_duration
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "2"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "30"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "3600"))
+# How long a claimed batch stays with its worker; long enough for every
+# message in it to hit SMTP_TIMEOUT
+OUTBOX_LEASE = float(os.getenv("OUTBOX_LEASE", "900"))
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff for the given number of failed attempts."""
+    seconds = min(OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX)
+    return timedelta(seconds=seconds)
+
+
+async def flush_admin_digest(
+    window: float = ADMIN_DIGEST_WINDOW, max_items: int = ADMIN_DIGEST_MAX_ITEMS
+) -> int:
+    """Fold held admin notifications into one pending digest email when due.
+
+    A digest is due once the oldest held notification is ``window`` seconds
+    old or ``max_items`` are waiting. Returns how many notifications went in.
+    """
+    async with SessionLocal() as db:
+        held = EmailOutbox.status == "held"
+        waiting = await db.scalar(select(func.count()).where(held))
+        if not waiting:
+            return 0
+        if waiting < max_items:
+            cutoff = db_now() - timedelta(seconds=window)
+            overdue = await db.scalar(
+                select(func.count()).where(held, EmailOutbox.created_at <= cutoff)
+            )
+            if not overdue:
+                return 0
+
+        result = await db.execute(
+            select(EmailOutbox)
+            .where(held)
+            .order_by(EmailOutbox.created_at, EmailOutbox.id)
+            .limit(max_items)
+            .with_for_update(skip_locked=True)
+        )
+        notifications = result.scalars().all()
+        if not notifications:
+            return 0
+
+        sections = [
+            f"=== {notification.subject} ===\n{notification.body.strip()}\n"
+            for notification in notifications
+        ]
+        queue_email(
+            db,
+            ADMIN_EMAIL,
+            f"Admin digest: {len(notifications)} new notifications",
+            "\n".join(sections),
+        )
+        for notification in notifications:
+            notification.status = "digested"
+        await db.commit()
+        return len(notifications)
+
+
+async def _claim_batch(batch_size: int) -> list[EmailOutbox]:
+    """Lease a batch of due messages to this worker and commit straight away.
+
+    Rows are picked with ``FOR UPDATE SKIP LOCKED`` so several app workers
+    can drain the same table without claiming a message twice. A ``sending``
+    row whose lease ran out belongs to a worker that died mid-batch and is
+    claimed again.
+    """
+    async with SessionLocal() as db:
+        now = db_now()
+        result = await db.execute(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status.in_(("pending", "sending")),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        messages = result.scalars().all()
+        for message in messages:
+            message.status = "sending"
+            message.next_attempt_at = now + timedelta(seconds=OUTBOX_LEASE)
+        await db.commit()
+        return messages
+
+
+async def _record(message: EmailOutbox, **values):
+    """Store the outcome of one send in its own short transaction."""
+    async with SessionLocal() as db:
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == message.id, EmailOutbox.status == "sending")
+            .values(**values)
+        )
+        await db.commit()
+
+
+async def drain_outbox(batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """Deliver one batch of due outbox messages and return how many were handled.
+
+    The batch is claimed first, then sent with no transaction or pooled
+    connection held open while SMTP is slow.
+    """
+    messages = await _claim_batch(batch_size)
+
+    for message in messages:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(
+                deliver_email, message.to_email, message.subject, message.body
+            )
+        except Exception as e:
+            smtp_send_duration.observe(time.perf_counter() - started, ("error",))
+            attempts = message.attempts + 1
+            if attempts >= OUTBOX_MAX_ATTEMPTS:
+                logger.error(
+                    "Outbox message %s to %s is dead after %s attempts: %s",
+                    message.id,
+                    message.to_email,
+                    attempts,
+                    e,
+                )
+                outcome = {"status": "dead"}
+            else:
+                outcome = {
+                    "status": "pending",
+                    "next_attempt_at": db_now() + backoff_delay(attempts),
+                }
+            await _record(
+                message, attempts=attempts, last_error=str(e)[:500], **outcome
+            )
+        else:
+            smtp_send_duration.observe(time.perf_counter() - started, ("sent",))
+            await _record(message, status="sent", sent_at=db_now())
+
+    return len(messages)
+
+
+async def run_outbox_worker(stop_event: asyncio.Event):
+    """Drain the outbox until ``stop_event`` is set."""
+    while not stop_event.is_set():
+        try:
+            await flush_admin_digest()
+            handled = await drain_outbox()
+        except Exception:
+            logger.exception("Outbox worker failed to drain the outbox")
+            handled = 0
+
+        # A full batch usually means there is more waiting; go again right away
+        if handled >= OUTBOX_BATCH_SIZE:
+            continue
+
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=OUTBOX_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
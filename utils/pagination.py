@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(
+    db: AsyncSession,
+    statement: Select,
+    model,
+    limit: int,
+    cursor: str | None = None,
+    scalars: bool = True,
+):
+    """Return one newest-first page of ``statement`` and the cursor for the next.
+
+    Pages are keyset seeks on ``(created_at, id)``, so each one is a bounded
+    range scan of the matching descending index however deep the client goes.
+    Pass ``scalars=False`` when selecting columns rather than an entity; the
+    columns must include ``created_at`` and ``id``.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(model.created_at, model.id) < (created_at, row_id)
+        )
+
+    statement = statement.order_by(model.created_at.desc(), model.id.desc())
+    result = await db.execute(statement.limit(limit + 1))
+    rows = result.scalars().all() if scalars else result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
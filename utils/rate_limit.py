@@ -0,0 +1,194 @@
+"""Token-bucket rate limiting for the public write endpoints.
+
+Each protected route has a budget such as ``5/minute``: a bucket of five
+tokens refilled at five per minute, kept per client IP and, separately, per
+email or username in the request body, so neither rotating addresses nor
+rotating emails gets round it. An empty bucket answers 429 with Retry-After.
+
+Buckets live in process memory by default. Set RATE_LIMIT_BACKEND=sqlite to
+share them between workers on one host through a SQLite file
+(RATE_LIMIT_SQLITE_PATH); anything offering ``hit()`` can stand in for it.
+"""
+
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+
+load_dotenv()
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "rate_limits.sqlite3")
+RATE_LIMIT_EVICT_INTERVAL = float(os.getenv("RATE_LIMIT_EVICT_INTERVAL", "60"))
+# Only behind a proxy that sets X-Forwarded-For; otherwise clients could forge it
+RATE_LIMIT_TRUST_FORWARDED = (
+    os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+)
+
+RATE_LIMITS = {
+    "bookings": os.getenv("RATE_LIMIT_BOOKINGS", "10/minute"),
+    "contact": os.getenv("RATE_LIMIT_CONTACT", "5/minute"),
+    "reviews": os.getenv("RATE_LIMIT_REVIEWS", "5/minute"),
+    "login": os.getenv("RATE_LIMIT_LOGIN", "10/minute"),
+}
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_budget(budget: str) -> tuple[float, float]:
+    """``"5/minute"`` as (capacity, tokens refilled per second)."""
+    count, _, period = budget.partition("/")
+    capacity = float(count)
+    return capacity, capacity / PERIODS[period.strip().rstrip("s")]
+
+
+class MemoryRateLimitBackend:
+    """Buckets in a dict: one lookup per hit, full buckets swept periodically."""
+
+    def __init__(self, evict_interval: float = RATE_LIMIT_EVICT_INTERVAL):
+        self.evict_interval = evict_interval
+        # key -> [tokens, updated_at, full_at]
+        self._buckets: dict[str, list[float]] = {}
+        self._next_eviction = time.monotonic() + evict_interval
+
+    def _evict(self, now: float):
+        # A bucket that has refilled completely is the same as no bucket
+        for key in [key for key, bucket in self._buckets.items() if bucket[2] <= now]:
+            del self._buckets[key]
+        self._next_eviction = now + self.evict_interval
+
+    async def hit(self, key: str, capacity: float, rate: float) -> float:
+        """Take a token from ``key``; return 0, or the seconds until one is free."""
+        now = time.monotonic()
+        if now >= self._next_eviction:
+            self._evict(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = [tokens, now, now + (capacity - tokens) / rate]
+        return wait
+
+
+class SQLiteRateLimitBackend:
+    """Buckets in a SQLite file, shared by every worker process on the host.
+
+    Each hit is one IMMEDIATE transaction, so workers updating the same
+    bucket serialize on the file lock rather than overwriting each other.
+    """
+
+    def __init__(
+        self,
+        path: str = RATE_LIMIT_SQLITE_PATH,
+        evict_interval: float = RATE_LIMIT_EVICT_INTERVAL,
+    ):
+        self.evict_interval = evict_interval
+        self._next_eviction = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated_at REAL NOT NULL, full_at REAL NOT NULL)"
+        )
+
+    def _hit(self, key: str, capacity: float, rate: float) -> float:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now >= self._next_eviction:
+                    self._conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+                    self._next_eviction = now + self.evict_interval
+
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    tokens = capacity
+                else:
+                    tokens = min(capacity, row[0] + max(now - row[1], 0) * rate)
+
+                if tokens >= 1:
+                    tokens -= 1
+                    wait = 0.0
+                else:
+                    wait = (1 - tokens) / rate
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, now + (capacity - tokens) / rate),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def hit(self, key: str, capacity: float, rate: float) -> float:
+        return await asyncio.to_thread(self._hit, key, capacity, rate)
+
+
+def create_backend():
+    if RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteRateLimitBackend()
+    return MemoryRateLimitBackend()
+
+
+backend = create_backend()
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(route: str, identity_field: str | None = None):
+    """Dependency enforcing ``RATE_LIMITS[route]`` per IP and per ``identity_field``.
+
+    ``identity_field`` names the body field holding the email or username.
+    """
+    capacity, rate = parse_budget(RATE_LIMITS[route])
+
+    async def check_rate_limit(request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        keys = [f"{route}:ip:{client_ip(request)}"]
+        if identity_field:
+            try:
+                identity = (await request.json()).get(identity_field)
+            except (ValueError, AttributeError):
+                identity = None
+            if isinstance(identity, str) and identity:
+                keys.append(f"{route}:id:{identity.strip().lower()}")
+
+        for key in keys:
+            wait = await backend.hit(key, capacity, rate)
+            if wait:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many requests, please try again later",
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+
+    return check_rate_limit
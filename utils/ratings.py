@@ -0,0 +1,91 @@
+"""Per-menu rating rollups.
+
+Rebuild the rollup from the reviews table with:
+
+    python -m utils.ratings
+"""
+
+import asyncio
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import SessionLocal, upsert
+from models import MenuRating, Review
+from routers.schemas import MenuRatingSummary
+
+STARS = range(1, 6)
+
+
+async def record_rating(db: AsyncSession, menu_id: int, rating: int):
+    """Add one review to the menu's rollup in the caller's transaction."""
+    star = getattr(MenuRating, f"stars_{rating}")
+    statement = (
+        upsert(db, MenuRating)
+        .values(
+            menu_id=menu_id,
+            review_count=1,
+            rating_sum=rating,
+            **{f"stars_{rating}": 1},
+        )
+        .on_conflict_do_update(
+            index_elements=[MenuRating.menu_id],
+            set_={
+                "review_count": MenuRating.review_count + 1,
+                "rating_sum": MenuRating.rating_sum + rating,
+                star.key: star + 1,
+            },
+        )
+    )
+    await db.execute(statement)
+
+
+def to_summary(menu_id: int, rollup: MenuRating | None) -> MenuRatingSummary:
+    if rollup is None or not rollup.review_count:
+        return MenuRatingSummary(
+            menu_id=menu_id,
+            review_count=0,
+            average_rating=None,
+            histogram={star: 0 for star in STARS},
+        )
+    return MenuRatingSummary(
+        menu_id=menu_id,
+        review_count=rollup.review_count,
+        average_rating=round(rollup.rating_sum / rollup.review_count, 2),
+        histogram={star: getattr(rollup, f"stars_{star}") for star in STARS},
+    )
+
+
+async def rebuild_ratings(db: AsyncSession) -> int:
+    """Recompute every rollup from the reviews table and return the menu count."""
+    totals = select(
+        Review.menu_id,
+        func.count(),
+        func.sum(Review.rating),
+        *[func.sum(case((Review.rating == star, 1), else_=0)) for star in STARS],
+    ).group_by(Review.menu_id)
+
+    await db.execute(delete(MenuRating))
+    result = await db.execute(
+        insert(MenuRating).from_select(
+            [
+                "menu_id",
+                "review_count",
+                "rating_sum",
+                *[f"stars_{star}" for star in STARS],
+            ],
+            totals,
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def main():
+    async with SessionLocal() as db:
+        menus = await rebuild_ratings(db)
+    print(f"Rebuilt rating summaries for {menus} menu items")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""Ranked full-text search over contact messages and review comments.
+
+On Postgres each table has a generated ``search_vector`` column with a GIN
+index, matched with ``websearch_to_tsquery`` and ranked by ``ts_rank``. On
+SQLite an FTS5 table per resource is matched instead and ranked by bm25.
+Both indexes are kept current by the database itself (see
+``models.SEARCH_DOCUMENTS``).
+
+Pages are keyset seeks on ``(rank, id)``, best match first.
+"""
+
+import asyncio
+import base64
+import json
+import re
+
+import orjson
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import column, func, literal_column, select, table, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import SessionLocal
+from models import SEARCH_DOCUMENTS, search_ddl
+from utils.serialization import response_columns
+
+SEARCH_LANGUAGE = "english"
+
+
+def encode_search_cursor(rank: float, row_id: int) -> str:
+    raw = json.dumps([rank, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def fts5_query(q: str) -> str:
+    """``q`` as an FTS5 query matching all of its words.
+
+    Each word is quoted so user input cannot inject FTS5 operators.
+    """
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", q))
+
+
+def _search_statement(db: AsyncSession, model, columns: list, q: str):
+    """Select ``columns`` plus a higher-is-better ``rank`` for rows matching ``q``."""
+    name = model.__tablename__
+    if db.get_bind().dialect.name == "sqlite":
+        fts = table(f"{name}_fts", column("rowid"))
+        fts_column = literal_column(f"{name}_fts")
+        # bm25 is lower-is-better; negate it so both dialects sort alike
+        rank = -func.bm25(fts_column)
+        statement = (
+            select(*columns, rank.label("rank"))
+            .join_from(model, fts, fts.c.rowid == model.id)
+            .where(fts_column.op("MATCH")(fts5_query(q)))
+        )
+    else:
+        vector = literal_column(f"{name}.search_vector")
+        query = func.websearch_to_tsquery(SEARCH_LANGUAGE, q)
+        rank = func.ts_rank(vector, query)
+        statement = select(*columns, rank.label("rank")).where(vector.op("@@")(query))
+    return statement, rank
+
+
+async def search_json(
+    db: AsyncSession,
+    model,
+    item_schema: type[BaseModel],
+    q: str,
+    limit: int,
+    cursor: str | None = None,
+) -> bytes:
+    """One page of ``model`` rows matching ``q``, best first, as page JSON."""
+    if model.__tablename__ not in SEARCH_DOCUMENTS:
+        raise ValueError(f"{model.__tablename__} is not searchable")
+    if not re.search(r"\w", q):
+        return orjson.dumps({"items": [], "next_cursor": None})
+
+    statement, rank = _search_statement(
+        db, model, response_columns(model, item_schema), q
+    )
+    if cursor:
+        statement = statement.where(
+            tuple_(rank, model.id) < decode_search_cursor(cursor)
+        )
+    statement = statement.order_by(rank.desc(), model.id.desc())
+    rows = (await db.execute(statement.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_search_cursor(rows[-1].rank, rows[-1].id)
+
+    items = []
+    for row in rows:
+        item = row._asdict()
+        del item["rank"]
+        items.append(item)
+    return orjson.dumps({"items": items, "next_cursor": next_cursor})
+
+
+async def rebuild_search_index(db: AsyncSession) -> int:
+    """Create any missing SQLite FTS5 tables and re-index the existing rows.
+
+    For databases created before search existed: ``create_all`` only adds the
+    FTS5 tables alongside new tables. Postgres needs a migration instead, and
+    fills its generated column for existing rows when the column is added.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return 0
+    for name, columns in SEARCH_DOCUMENTS.items():
+        exists = await db.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+            {"name": f"{name}_fts"},
+        )
+        if not exists:
+            for statement in search_ddl(name, columns)["sqlite"]:
+                await db.execute(text(statement))
+        await db.execute(text(f"INSERT INTO {name}_fts({name}_fts) VALUES ('rebuild')"))
+    await db.commit()
+    return len(SEARCH_DOCUMENTS)
+
+
+async def main():
+    async with SessionLocal() as db:
+        tables = await rebuild_search_index(db)
+    print(f"Rebuilt {tables} full-text search indexes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+import os
+
+import orjson
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from utils.pagination import paginate
+
+load_dotenv()
+
+# Serialize admin lists straight from column tuples with orjson, skipping
+# pydantic validation of each row. The response schema is unchanged.
+FAST_LIST_RESPONSES = os.getenv("FAST_LIST_RESPONSES", "false").lower() == "true"
+
+
+# Keyset pagination needs these whatever the client asked for
+CURSOR_FIELDS = ("id", "created_at")
+
+
+def response_columns(
+    model, schema: type[BaseModel], fields: list[str] | None = None
+) -> list:
+    """The model columns backing each field of a response schema, or ``fields``."""
+    return [getattr(model, field) for field in fields or schema.model_fields]
+
+
+def parse_fields(schema: type[BaseModel], fields: str | None) -> list[str] | None:
+    """Validate a ``fields=a,b`` projection against ``schema``, in schema order."""
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.update(CURSOR_FIELDS)
+    return [field for field in schema.model_fields if field in requested]
+
+
+def dump_rows(rows, next_cursor: str | None) -> bytes:
+    """Serialize column rows as a page; rows are trusted to match the schema."""
+    return orjson.dumps(
+        {"items": [row._asdict() for row in rows], "next_cursor": next_cursor}
+    )
+
+
+async def page_json(
+    db: AsyncSession,
+    model,
+    item_schema: type[BaseModel],
+    page_schema: type[BaseModel],
+    limit: int,
+    cursor: str | None,
+    fields: list[str] | None = None,
+    filters: list = (),
+) -> bytes:
+    """Fetch one keyset page of ``model`` and return it as JSON bytes.
+
+    ``fields`` (from parse_fields) selects only those columns; ``filters``
+    are SQL conditions applied before paging.
+    """
+    if fields or FAST_LIST_RESPONSES:
+        statement = select(*response_columns(model, item_schema, fields))
+        rows, next_cursor = await paginate(
+            db, statement.where(*filters), model, limit, cursor, scalars=False
+        )
+        return dump_rows(rows, next_cursor)
+
+    statement = select(model).where(*filters)
+    items, next_cursor = await paginate(db, statement, model, limit, cursor)
+    return page_schema(items=items, next_cursor=next_cursor).model_dump_json().encode()
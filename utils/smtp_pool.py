@@ -0,0 +1,214 @@
+import os
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", os.getenv("APP_EMAIL"))
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", os.getenv("APP_PASSWORD"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", str(SMTP_PORT == 465)).lower() == "true"
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", str(not SMTP_USE_SSL)).lower() == "true"
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_NOOP_AFTER = float(os.getenv("SMTP_NOOP_AFTER", "30"))
+SMTP_MAX_IDLE = float(os.getenv("SMTP_MAX_IDLE", "240"))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+FROM_EMAIL = os.getenv("FROM_EMAIL", SMTP_USERNAME)
+
+
+# Rejections of a single message; the session stays usable after RSET
+PER_MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+class SMTPSessionPool:
+    """A small pool of logged-in SMTP sessions shared between threads.
+
+    Sessions that sat idle for more than ``noop_after`` seconds are checked
+    with NOOP before reuse, and sessions idle for longer than ``max_idle``
+    are closed rather than reused, since most providers drop them anyway.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        use_ssl: bool = False,
+        starttls: bool = True,
+        size: int = 2,
+        noop_after: float = 30,
+        max_idle: float = 240,
+        timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.noop_after = noop_after
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.handshakes = 0
+        self._handshakes_lock = threading.Lock()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._close(smtp)
+            raise
+        with self._handshakes_lock:
+            self.handshakes += 1
+        return smtp
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    @staticmethod
+    def _is_alive(smtp: smtplib.SMTP) -> bool:
+        try:
+            return smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            try:
+                smtp, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            idle = time.monotonic() - last_used
+            if idle > self.max_idle or (
+                idle > self.noop_after and not self._is_alive(smtp)
+            ):
+                self._close(smtp)
+                continue
+            return smtp
+
+    @staticmethod
+    def _reset(smtp: smtplib.SMTP) -> bool:
+        """RSET after a rejected message; False if the session is unusable."""
+        try:
+            return smtp.rset()[0] == 250
+        except smtplib.SMTPServerDisconnected:
+            return False
+
+    @contextmanager
+    def session(self):
+        """Borrow a logged-in session, returning it to the pool afterwards.
+
+        A message the server rejects leaves the session usable, so after
+        one of PER_MESSAGE_ERRORS it is reset and pooled again.
+        """
+        self._slots.acquire()
+        smtp = None
+        try:
+            smtp = self._checkout()
+            yield smtp
+        except smtplib.SMTPServerDisconnected:
+            smtp = None
+            raise
+        except PER_MESSAGE_ERRORS:
+            if not self._reset(smtp):
+                self._close(smtp)
+                smtp = None
+            raise
+        except Exception:
+            if smtp is not None:
+                self._close(smtp)
+                smtp = None
+            raise
+        finally:
+            if smtp is not None:
+                self._idle.put((smtp, time.monotonic()))
+            self._slots.release()
+
+    def send_messages(self, messages: list[Message]) -> dict[int, Exception]:
+        """Send several messages over one session; return rejections by index.
+
+        A message the server refuses, say for a bad recipient, is reported
+        and the rest of the batch carries on over the same session. If the
+        server drops a pooled session mid-batch, the other idle sessions are
+        discarded too and the pool reconnects once, carrying on with the
+        message that failed.
+        """
+        failures = {}
+        pending = list(enumerate(messages))
+        reconnected = False
+        while pending:
+            try:
+                with self.session() as smtp:
+                    while pending:
+                        index, message = pending[0]
+                        try:
+                            smtp.send_message(message)
+                        except PER_MESSAGE_ERRORS as e:
+                            failures[index] = e
+                            pending.pop(0)
+                            if not self._reset(smtp):
+                                raise smtplib.SMTPServerDisconnected(
+                                    "Connection lost after a rejected message"
+                                )
+                        else:
+                            pending.pop(0)
+            except smtplib.SMTPServerDisconnected:
+                if reconnected:
+                    raise
+                reconnected = True
+                self.close()
+        return failures
+
+    def send_message(self, message: Message):
+        """Send one message, raising if the server rejects it."""
+        failures = self.send_messages([message])
+        if failures:
+            raise failures[0]
+
+    def close(self):
+        """Close every idle session."""
+        while True:
+            try:
+                smtp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(smtp)
+
+
+smtp_pool = SMTPSessionPool(
+    SMTP_SERVER,
+    SMTP_PORT,
+    username=SMTP_USERNAME,
+    password=SMTP_PASSWORD,
+    use_ssl=SMTP_USE_SSL,
+    starttls=SMTP_STARTTLS,
+    size=SMTP_POOL_SIZE,
+    noop_after=SMTP_NOOP_AFTER,
+    max_idle=SMTP_MAX_IDLE,
+    timeout=SMTP_TIMEOUT,
+)
@@ -0,0 +1,167 @@
+"""Slow-query log, N+1 detection and a per-request SQL breakdown.
+
+Statements slower than SLOW_QUERY_MS are logged with their normalized SQL,
+a hash of their parameters (the values themselves may be customer data),
+the row count and the route that ran them. When one request runs the same
+statement shape more than N_PLUS_ONE_THRESHOLD times, that is logged as a
+likely N+1. With SQL_DEBUG_HEADER_ENABLED set, a request sending
+``X-Debug-SQL: 1`` gets its SQL timings back in a Server-Timing header.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.metrics import route_label
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+# Never enable in production: the header exposes the shape of every query
+SQL_DEBUG_HEADER_ENABLED = (
+    os.getenv("SQL_DEBUG_HEADER_ENABLED", "false").lower() == "true"
+)
+SQL_DEBUG_HEADER = "x-debug-sql"
+SERVER_TIMING_ENTRIES = 10
+
+_WHITESPACE = re.compile(r"\s+")
+# String and number literals, and the bind parameter styles of our drivers
+_LITERALS = re.compile(
+    r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+|%\(\w+\)s|(?<![:\w]):\w+|\?"
+)
+_VALUE_LISTS = re.compile(r"\(\?(?:, \?)+\)")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Collapse ``statement`` to its shape: literals and parameters become ``?``."""
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _LITERALS.sub("?", sql)
+    return _VALUE_LISTS.sub("(...)", sql)
+
+
+def params_hash(parameters) -> str:
+    return hashlib.sha256(repr(parameters).encode()).hexdigest()[:12]
+
+
+class RequestProfile:
+    """SQL statements run while handling one request, grouped by shape."""
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        # shape -> [count, seconds]
+        self.statements: dict[str, list] = {}
+
+    @property
+    def route(self) -> str:
+        return f"{self.scope['method']} {route_label(self.scope)}"
+
+    def record(self, shape: str, elapsed: float):
+        self.count += 1
+        self.seconds += elapsed
+        stats = self.statements.get(shape)
+        if stats is None:
+            self.statements[shape] = [1, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+
+    def report_n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        if threshold <= 0:
+            return
+        for shape, (count, seconds) in self.statements.items():
+            if count > threshold:
+                logger.warning(
+                    "Possible N+1 on %s: %s runs (%.1f ms) of %s",
+                    self.route,
+                    count,
+                    seconds * 1000,
+                    shape,
+                )
+
+    def server_timing(self) -> str:
+        entries = [f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"']
+        slowest = sorted(
+            self.statements.items(), key=lambda item: item[1][1], reverse=True
+        )
+        for i, (shape, (count, seconds)) in enumerate(slowest[:SERVER_TIMING_ENTRIES]):
+            description = f"{count}x {shape}"[:120]
+            description = description.replace("\\", "\\\\").replace('"', '\\"')
+            entries.append(f'sql{i};dur={seconds * 1000:.2f};desc="{description}"')
+        return ", ".join(entries)
+
+
+_current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "sql_profile", default=None
+)
+
+
+def profile_engine(engine, slow_query_ms: float = SLOW_QUERY_MS):
+    """Time every statement run through ``engine`` (sync or async)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    slow_seconds = slow_query_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profiler_started"].pop()
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(normalize_sql(statement), elapsed)
+        if elapsed >= slow_seconds:
+            logger.warning(
+                "Slow query (%.1f ms, %s rows, params %s) on %s: %s",
+                elapsed * 1000,
+                cursor.rowcount,
+                params_hash(parameters),
+                profile.route if profile is not None else "background",
+                normalize_sql(statement),
+            )
+
+
+class SQLProfilerMiddleware:
+    """Collect a RequestProfile per request and check it for N+1 patterns."""
+
+    def __init__(self, app: ASGIApp, debug_header: bool = SQL_DEBUG_HEADER_ENABLED):
+        self.app = app
+        self.debug_header = debug_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile(scope)
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", profile.server_timing()
+                )
+            await send(message)
+
+        debug = self.debug_header and (
+            Headers(scope=scope).get(SQL_DEBUG_HEADER) in ("1", "true")
+        )
+        try:
+            await self.app(scope, receive, send_with_timing if debug else send)
+        finally:
+            _current_profile.reset(token)
+            profile.report_n_plus_one()
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import re
+import stat
+from functools import lru_cache
+from mimetypes import guess_type
+
+import anyio
+from dotenv import load_dotenv
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Receive, Scope, Send
+
+load_dotenv()
+
+# Cache lifetime for files whose names do not carry a content hash
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "300"))
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Precompressed siblings, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Written by utils.build_static: original name -> hashed copy
+MANIFEST_NAME = "manifest.json"
+
+# e.g. "goat-platter.3f2a9c1b7d4e.jpg", as written by utils.build_static
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+
+def is_hashed_name(path: str) -> bool:
+    """Whether ``path`` looks like a copy written by utils.build_static."""
+    return bool(HASHED_NAME.search(os.path.basename(path)))
+
+
+@lru_cache(maxsize=16)
+def _load_hashed_names(manifest_path: str, mtime_ns: int) -> frozenset[str]:
+    try:
+        with open(manifest_path) as file:
+            return frozenset(json.load(file).values())
+    except (OSError, ValueError, AttributeError):
+        return frozenset()
+
+
+def hashed_names(directory: str) -> frozenset[str]:
+    """Hashed copies listed in ``directory``'s manifest, relative with ``/``.
+
+    Only these are cached as immutable: an upload that merely looks hashed,
+    such as ``menu.20240101.jpg``, can still be overwritten in place.
+    """
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    try:
+        mtime_ns = os.stat(manifest_path).st_mtime_ns
+    except OSError:
+        return frozenset()
+    return _load_hashed_names(manifest_path, mtime_ns)
+
+
+@lru_cache(maxsize=4096)
+def _content_etag(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def content_etag(path: str, stat_result: os.stat_result) -> str:
+    """Strong ETag from the file's bytes, hashed once per (path, mtime, size)."""
+    return _content_etag(str(path), stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def accepted_encodings(request_headers: Headers) -> set[str]:
+    """Content codings the client accepts, from its Accept-Encoding header."""
+    accepted = set()
+    for part in request_headers.get("accept-encoding", "").split(","):
+        coding, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+class StaticFileResponse(FileResponse):
+    """FileResponse that hands whole-file bodies to the server when it can.
+
+    Servers advertising the ``http.response.pathsend`` or
+    ``http.response.zerocopysend`` ASGI extensions send the file with
+    sendfile() instead of reading it through Python in chunks.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._extensions = scope.get("extensions") or {}
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        if send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+
+        if "http.response.pathsend" in self._extensions:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+        elif "http.response.zerocopysend" in self._extensions:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            with open(self.path, "rb") as file:
+                await send({"type": "http.response.zerocopysend", "file": file})
+        else:
+            await super()._handle_simple(send, send_header_only)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with long-lived caching, strong ETags and precompressed variants.
+
+    Hashed copies listed in the build manifest are cached for a year as
+    immutable; other files get ``STATIC_MAX_AGE``. A ``.br`` or ``.gz`` sibling written by
+    ``utils.build_static`` is served instead of the original when the client
+    accepts that encoding. Range requests are handled by FileResponse.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            try:
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path
+                )
+            except OSError:
+                full_path, stat_result = "", None
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                # Negotiation stats siblings and the first ETag reads the
+                # whole file, so keep both off the event loop
+                return await anyio.to_thread.run_sync(
+                    self._static_response, full_path, stat_result, Headers(scope=scope)
+                )
+        return await super().get_response(path, scope)
+
+    def _negotiate(
+        self, full_path: str, stat_result: os.stat_result, request_headers: Headers
+    ) -> tuple[str, os.stat_result, str | None]:
+        accepted = accepted_encodings(request_headers)
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            # Ignore variants left behind by an older version of the file
+            if (
+                stat.S_ISREG(variant.st_mode)
+                and variant.st_mtime >= stat_result.st_mtime
+            ):
+                return full_path + suffix, variant, encoding
+        return full_path, stat_result, None
+
+    def _static_response(
+        self, full_path: str, stat_result: os.stat_result, request_headers: Headers
+    ) -> Response:
+        path, path_stat, encoding = self._negotiate(
+            full_path, stat_result, request_headers
+        )
+
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        headers = {
+            "cache-control": (
+                IMMUTABLE_CACHE_CONTROL
+                if relative in hashed_names(str(self.directory))
+                else f"public, max-age={STATIC_MAX_AGE}"
+            ),
+            "etag": content_etag(path, path_stat),
+            "vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["content-encoding"] = encoding
+
+        response = StaticFileResponse(
+            path,
+            stat_result=path_stat,
+            headers=headers,
+            media_type=guess_type(full_path)[0] or "text/plain",
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
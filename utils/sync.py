@@ -0,0 +1,125 @@
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dependencies import db_now
+from models import Booking, Contact, Review, Tombstone
+
+load_dotenv()
+
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+# Rows are re-sent for this long after a sync, so a write whose transaction
+# was still open while the client synced is not skipped
+SYNC_OVERLAP = float(os.getenv("SYNC_OVERLAP", "5"))
+
+SYNCED_MODELS = {"bookings": Booking, "contacts": Contact, "reviews": Review}
+
+# (timestamp, id) per stream, the position each one has been read up to
+Positions = dict[str, tuple[datetime, int]]
+
+_START = (datetime.min, 0)
+
+
+def encode_sync_token(positions: Positions) -> str:
+    raw = json.dumps(
+        {
+            name: [moment.isoformat(), row_id]
+            for name, (moment, row_id) in positions.items()
+        }
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_token(token: str | None) -> Positions:
+    streams = (*SYNCED_MODELS, "tombstones")
+    if not token:
+        return {name: _START for name in streams}
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded))
+        return {
+            name: (datetime.fromisoformat(raw[name][0]), int(raw[name][1]))
+            for name in streams
+        }
+    except (ValueError, TypeError, KeyError, IndexError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+async def _read_stream(
+    db: AsyncSession, statement, moment_column, id_column, position, limit: int
+):
+    result = await db.execute(
+        statement.where(tuple_(moment_column, id_column) > position)
+        .order_by(moment_column, id_column)
+        .limit(limit + 1)
+    )
+    rows = result.scalars().all()
+    return rows[:limit], len(rows) > limit
+
+
+def _advance(position, last, caught_up, safe_point):
+    """Where a stream resumes next time.
+
+    Mid-backlog it continues right after the last row sent. Once caught up
+    it steps back to ``safe_point`` so late commits are picked up too; the
+    client sees those rows twice and simply applies them again.
+    """
+    if not caught_up:
+        return last
+    if last is None:
+        return max(position, safe_point)
+    return max(position, min(last, safe_point))
+
+
+async def changes_since(
+    db: AsyncSession, token: str | None, limit: int = SYNC_PAGE_SIZE
+) -> dict:
+    """Rows created, changed or deleted since ``token``, and the next token.
+
+    Each stream returns at most ``limit`` rows; ``has_more`` asks the client
+    to call again straight away with the new token.
+    """
+    positions = decode_sync_token(token)
+    safe_point = (db_now() - timedelta(seconds=SYNC_OVERLAP), 0)
+
+    changes = {}
+    next_positions = {}
+    has_more = False
+    for name, model in SYNCED_MODELS.items():
+        rows, more = await _read_stream(
+            db, select(model), model.updated_at, model.id, positions[name], limit
+        )
+        changes[name] = rows
+        last = (rows[-1].updated_at, rows[-1].id) if rows else None
+        next_positions[name] = _advance(positions[name], last, not more, safe_point)
+        has_more = has_more or more
+
+    tombstones, more = await _read_stream(
+        db,
+        select(Tombstone),
+        Tombstone.deleted_at,
+        Tombstone.id,
+        positions["tombstones"],
+        limit,
+    )
+    deleted = {name: [] for name in SYNCED_MODELS}
+    for tombstone in tombstones:
+        deleted[tombstone.resource].append(tombstone.row_id)
+    last = (tombstones[-1].deleted_at, tombstones[-1].id) if tombstones else None
+    next_positions["tombstones"] = _advance(
+        positions["tombstones"], last, not more, safe_point
+    )
+    has_more = has_more or more
+
+    return {
+        **changes,
+        "deleted": deleted,
+        "next_token": encode_sync_token(next_positions),
+        "has_more": has_more,
+    }